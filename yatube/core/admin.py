@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import DeadJob, Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("pk", "name", "attempts", "run_after", "locked_until")
+    list_filter = ("name",)
+
+
+class DeadJobAdmin(admin.ModelAdmin):
+    list_display = ("pk", "name", "attempts", "failed")
+    list_filter = ("name",)
+
+
+admin.site.register(Job, JobAdmin)
+admin.site.register(DeadJob, DeadJobAdmin)
@@ -0,0 +1,20 @@
+import base64
+import binascii
+
+from django.contrib.auth import authenticate
+
+
+def basic_auth_user(request):
+    """Пользователь из заголовка Authorization: Basic или None."""
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    scheme, _, credentials = header.partition(" ")
+    if scheme.lower() != "basic":
+        return None
+    try:
+        decoded = base64.b64decode(credentials.strip()).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    username, separator, password = decoded.partition(":")
+    if not separator:
+        return None
+    return authenticate(request, username=username, password=password)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    """Инвалидация и счётчики живут в кеше, поэтому он должен быть общим."""
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.JOBS_ALWAYS_EAGER or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            f"Кеш {backend} не общий для процессов",
+            hint=(
+                "Воркеры и веб-процессы не увидят инвалидацию друг друга, "
+                "а лимиты запросов будут считаться в каждом процессе. "
+                "Задайте CACHE_BACKEND и CACHE_LOCATION, например memcached."
+            ),
+            id="core.W001",
+        )
+    ]
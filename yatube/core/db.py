@@ -0,0 +1,7 @@
+def raw_delete(queryset):
+    """Удаляет строки одним DELETE без загрузки объектов и сигналов.
+
+    Каскад тоже не выполняется: зависимые строки удаляет вызывающий код.
+    Возвращает число удалённых строк.
+    """
+    return queryset._raw_delete(queryset.db)
@@ -0,0 +1,66 @@
+import re
+
+from django.conf import settings
+from django.core import signing
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import urlencode
+
+HOLE_SALT = "core.holes"
+HOLE_PATTERN = re.compile(rb"<!--hole:([\w.:-]+)-->")
+
+_holes = {}
+
+
+def hole(name, template_name):
+    """Регистрирует фрагмент страницы, который зависит от пользователя.
+
+    Функция получает request и аргументы тега {% hole %} и возвращает
+    контекст шаблона template_name.
+    """
+    def decorator(func):
+        _holes[name] = (template_name, func)
+        return func
+    return decorator
+
+
+def render_hole(request, name, args):
+    template_name, get_context = _holes[name]
+    return render_to_string(
+        template_name, get_context(request, **args), request=request
+    )
+
+
+def placeholder(name, args):
+    token = signing.dumps([name, args], salt=HOLE_SALT, compress=True)
+    return f"<!--hole:{token}-->"
+
+
+def load_token(token):
+    """Возвращает (name, args) или бросает signing.BadSignature."""
+    name, args = signing.loads(token, salt=HOLE_SALT)
+    if name not in _holes:
+        raise signing.BadSignature(name)
+    return name, args
+
+
+def fill_holes(content, request):
+    """Заменяет метки в общей оболочке страницы фрагментами запроса.
+
+    При HOLE_PUNCHING_MODE = "esi" вместо рендера ставится
+    <esi:include>, и фрагмент запрашивает прокси перед приложением.
+    """
+    def replace(match):
+        token = match.group(1).decode()
+        if settings.HOLE_PUNCHING_MODE == "esi":
+            url = reverse("hole") + "?" + urlencode({"h": token})
+            return f'<esi:include src="{url}"/>'.encode()
+        name, args = load_token(token)
+        return render_hole(request, name, args).encode()
+
+    return HOLE_PATTERN.sub(replace, content)
+
+
+@hole("core.user_menu", "includes/user_menu.html")
+def user_menu(request, view_name=""):
+    return {"view_name": view_name}
@@ -0,0 +1,44 @@
+from django.conf import settings
+from PIL import Image
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.base import EXTENSIONS
+
+MIME_TYPES = {
+    "AVIF": "image/avif",
+    "WEBP": "image/webp",
+    "JPEG": "image/jpeg",
+}
+
+
+def modern_formats():
+    """Форматы, которые умеют сохранять и Pillow, и sorl-thumbnail."""
+    Image.init()
+    return [
+        image_format
+        for image_format in settings.RESPONSIVE_IMAGE_FORMATS
+        if image_format in Image.SAVE and image_format in EXTENSIONS
+    ]
+
+
+def image_variants(image, geometry):
+    """Генерирует миниатюры image всех ширин во всех форматах.
+
+    Возвращает словарь {формат: [миниатюры по возрастанию ширины]},
+    последним идёт JPEG как запасной вариант.
+    """
+    width, height = (int(side) for side in geometry.split("x"))
+    variants = {}
+    for image_format in modern_formats() + ["JPEG"]:
+        variants[image_format] = [
+            get_thumbnail(
+                image,
+                f"{size}x{round(size * height / width)}",
+                crop="center",
+                upscale=True,
+                format=image_format,
+                quality=settings.RESPONSIVE_IMAGE_QUALITY,
+            )
+            for size in settings.RESPONSIVE_IMAGE_WIDTHS
+            if size <= width
+        ]
+    return variants
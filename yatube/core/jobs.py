@@ -0,0 +1,160 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DeadJob, Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_non_atomic = set()
+_current = None
+
+
+class LeaseLost(Exception):
+    """Задачу захватил другой воркер, пока эта ещё выполнялась."""
+
+
+def job(name, atomic=True):
+    """Регистрирует обработчик задачи. Обработчик должен быть идемпотентным:
+    задача может выполниться повторно, если воркер упал после её запуска.
+    Аргументы name и delay зарезервированы за enqueue.
+
+    С atomic=False обработчик выполняется вне общей транзакции: долгие
+    пачечные обработчики сами фиксируют каждую пачку и продлевают захват
+    через extend_lease."""
+    def decorator(func):
+        _handlers[name] = func
+        if not atomic:
+            _non_atomic.add(name)
+        return func
+    return decorator
+
+
+def enqueue(name, delay=None, **payload):
+    """Ставит задачу после фиксации текущей транзакции.
+
+    Задача не увидит незафиксированных данных и не выполнится вовсе,
+    если транзакция откатится. С delay задача выполнится не раньше чем
+    через delay секунд; в eager-режиме такие задачи не выполняются."""
+    if name not in _handlers:
+        raise KeyError(f"Неизвестная задача {name}")
+    transaction.on_commit(lambda: _dispatch(name, payload, delay))
+
+
+def _dispatch(name, payload, delay=None):
+    if delay and settings.JOBS_ALWAYS_EAGER:
+        logger.info("Отложенная задача %s пропущена в eager-режиме", name)
+        return
+    if settings.JOBS_ALWAYS_EAGER:
+        # Как и воркер, ошибку задачи не пробрасываем в вызывающий код.
+        try:
+            _handlers[name](**payload)
+        except Exception:
+            logger.exception("Задача %s завершилась ошибкой", name)
+        return
+    run_after = timezone.now() + timedelta(seconds=delay or 0)
+    Job.objects.create(
+        name=name, payload=json.dumps(payload), run_after=run_after
+    )
+
+
+def claim(batch_size):
+    """Захватывает до batch_size готовых задач на время JOBS_LEASE_SECONDS.
+
+    Захват делается условным UPDATE, поэтому несколько воркеров
+    не получат одну и ту же задачу и без SELECT ... FOR UPDATE."""
+    now = timezone.now()
+    lease = now + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+    candidates = Job.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        run_after__lte=now,
+    )[:batch_size]
+    claimed = []
+    for candidate in candidates:
+        updated = Job.objects.filter(
+            pk=candidate.pk, locked_until=candidate.locked_until
+        ).update(locked_until=lease)
+        if updated:
+            candidate.locked_until = lease
+            claimed.append(candidate)
+    return claimed
+
+
+def extend_lease():
+    """Продлевает захват выполняемой задачи, если он истекает.
+
+    Вне воркера ничего не делает. Продление — условный UPDATE, поэтому
+    если задачу уже перехватил другой воркер, бросает LeaseLost."""
+    if _current is None:
+        return
+    now = timezone.now()
+    if _current.locked_until - now > timedelta(
+        seconds=settings.JOBS_LEASE_SECONDS / 2
+    ):
+        return
+    lease = now + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+    updated = Job.objects.filter(
+        pk=_current.pk, locked_until=_current.locked_until
+    ).update(locked_until=lease)
+    if not updated:
+        raise LeaseLost(str(_current))
+    _current.locked_until = lease
+
+
+def run_job(job):
+    global _current
+    handler = _handlers[job.name]
+    _current = job
+    try:
+        if job.name in _non_atomic:
+            handler(**json.loads(job.payload))
+        else:
+            with transaction.atomic():
+                handler(**json.loads(job.payload))
+    except LeaseLost:
+        logger.warning("Задачу %s перехватил другой воркер", job)
+        return False
+    except Exception:
+        _fail(job, traceback.format_exc())
+        return False
+    finally:
+        _current = None
+    job.delete()
+    return True
+
+
+def _fail(job, error):
+    job.attempts += 1
+    job.last_error = error
+    if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+        logger.error("Задача %s перенесена в dead-letter: %s", job, error)
+        with transaction.atomic():
+            DeadJob.objects.create(
+                name=job.name,
+                payload=job.payload,
+                attempts=job.attempts,
+                last_error=error,
+                created=job.created,
+            )
+            job.delete()
+        return
+    delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+    job.run_after = timezone.now() + timedelta(seconds=delay)
+    job.locked_until = None
+    job.save(update_fields=["attempts", "last_error", "run_after",
+                            "locked_until"])
+
+
+def run_pending(batch_size=100):
+    """Выполняет готовые задачи и возвращает число обработанных."""
+    jobs = claim(batch_size)
+    for claimed in jobs:
+        run_job(claimed)
+    return len(jobs)
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.middleware import brotli, compress, minify_html
+
+
+def measure(func, iterations):
+    """Возвращает результат func и среднее процессорное время в мс."""
+    start = time.process_time()
+    for _ in range(iterations):
+        result = func()
+    return result, (time.process_time() - start) * 1000 / iterations
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает размер ответа и процессорное время минификации и сжатия "
+        "для страниц сайта."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", default=["/"])
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        client = Client()
+        header = (
+            f"{'url':<30}{'raw':>9}{'min':>9}{'gzip':>9}{'br':>9}"
+            f"{'render':>10}{'min ms':>9}{'gzip ms':>9}{'br ms':>9}"
+        )
+        self.stdout.write(header)
+        for url in options["urls"]:
+            with override_settings(HTML_MINIFY=False):
+                response, render_ms = measure(
+                    lambda: client.get(url), iterations
+                )
+            raw = response.content
+            minified, minify_ms = measure(lambda: minify_html(raw), iterations)
+            gzipped, gzip_ms = measure(
+                lambda: compress(minified, "gzip"), iterations
+            )
+            br_size, br_ms = "-", "-"
+            if brotli is not None:
+                compressed, br_ms = measure(
+                    lambda: compress(minified, "br"), iterations
+                )
+                br_size, br_ms = len(compressed), f"{br_ms:.2f}"
+            self.stdout.write(
+                f"{url:<30}{len(raw):>9}{len(minified):>9}{len(gzipped):>9}"
+                f"{br_size:>9}{render_ms:>10.2f}{minify_ms:>9.2f}"
+                f"{gzip_ms:>9.2f}{br_ms:>9}"
+            )
+        self.stdout.write(
+            f"gzip level {settings.COMPRESS_GZIP_LEVEL}, "
+            f"brotli quality {settings.COMPRESS_BROTLI_QUALITY}"
+        )
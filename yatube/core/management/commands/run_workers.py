@@ -0,0 +1,70 @@
+import logging
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from core.jobs import run_pending
+
+logger = logging.getLogger(__name__)
+
+
+def work(batch_size, idle_sleep):
+    """Цикл воркера. Ошибка очереди вроде «database is locked» не
+    должна останавливать процесс: её пишем в лог и пробуем снова."""
+    while True:
+        try:
+            done = run_pending(batch_size)
+        except Exception:
+            logger.exception("Ошибка при разборе очереди задач")
+            close_old_connections()
+            done = 0
+        if not done:
+            time.sleep(idle_sleep)
+
+
+class Command(BaseCommand):
+    help = "Запускает пул воркеров, выполняющих задачи из очереди."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=os.cpu_count() or 1
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--idle-sleep", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить готовые задачи в текущем процессе и выйти.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while True:
+                done = run_pending(options["batch_size"])
+                if not done:
+                    break
+                total += done
+            self.stdout.write(f"Выполнено задач: {total}")
+            return
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=work,
+                args=(options["batch_size"], options["idle_sleep"]),
+                daemon=True,
+            )
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Запущено воркеров: {len(workers)}")
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
@@ -0,0 +1,114 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+# Имена файлов из хеша содержимого (ContentAddressedStorage и кеш sorl)
+# никогда не меняют содержимое, поэтому их можно кешировать навсегда.
+HASHED_NAME = re.compile(r"(^|/)[0-9a-f]{32,64}\.\w+$")
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def cache_control(path):
+    if HASHED_NAME.search(path):
+        return (
+            f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+        )
+    return f"public, max-age={settings.MEDIA_MAX_AGE}"
+
+
+def parse_range(header, size):
+    """Возвращает (start, end) для одиночного диапазона Range или None."""
+    match = RANGE.match(header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if start:
+        start, end = int(start), min(int(end or size - 1), size - 1)
+    else:
+        start, end = max(size - int(end), 0), size - 1
+    if start > end:
+        return None
+    return start, end
+
+
+def read_range(fullpath, start, end):
+    with open(fullpath, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдаёт файл из MEDIA_ROOT.
+
+    Если настроен MEDIA_SENDFILE_BACKEND, передачу файла выполняет
+    фронтовый прокси, а Django только выставляет заголовки.
+    """
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден")
+    if not os.path.isfile(fullpath):
+        raise Http404("Файл не найден")
+    stat = os.stat(fullpath)
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"),
+        stat.st_mtime,
+        stat.st_size,
+    ):
+        response = HttpResponseNotModified()
+        response["Cache-Control"] = cache_control(path)
+        return response
+    content_type = mimetypes.guess_type(fullpath)[0]
+    content_type = content_type or "application/octet-stream"
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    # Не-ASCII пути в заголовках прокси понимает только в %-кодировке.
+    if backend == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        )
+    elif backend == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = quote(fullpath)
+    else:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), stat.st_size)
+        if byte_range is None:
+            response = FileResponse(
+                open(fullpath, "rb"), content_type=content_type
+            )
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(fullpath, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = end - start + 1
+        response["Accept-Ranges"] = "bytes"
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = cache_control(path)
+    return response
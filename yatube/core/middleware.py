@@ -0,0 +1,140 @@
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .ratelimit import check, view_limit
+from .static import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Внутри этих тегов пробелы значимы, их не трогаем.
+PROTECTED = re.compile(
+    rb"(<(pre|textarea|script|style)\b.*?</\2>)", re.DOTALL | re.IGNORECASE
+)
+WHITESPACE_WITH_NEWLINE = re.compile(rb"\s*\n\s*")
+WHITESPACE = re.compile(rb"[ \t]{2,}")
+
+
+def minify_html(content):
+    """Схлопывает пробельные последовательности вне <pre>, <textarea> и т.п.
+
+    Последовательность с переводом строки заменяется одним переводом
+    строки, остальные — одним пробелом, так что отображение не меняется.
+    """
+    parts = PROTECTED.split(content)
+    result = []
+    # split с двумя группами даёт: текст, блок, имя тега, текст, ...
+    for index in range(0, len(parts), 3):
+        text = WHITESPACE_WITH_NEWLINE.sub(b"\n", parts[index])
+        result.append(WHITESPACE.sub(b" ", text))
+        if index + 1 < len(parts):
+            result.append(parts[index + 1])
+    return b"".join(result)
+
+
+def choose_encoding(request):
+    codings = ("br", "gzip") if brotli is not None else ("gzip",)
+    accepted = accepted_encodings(request, codings)
+    for coding in codings:
+        if coding in accepted:
+            return coding
+    return None
+
+
+def compressor(encoding):
+    if encoding == "br":
+        return brotli.Compressor(quality=settings.COMPRESS_BROTLI_QUALITY)
+    return zlib.compressobj(settings.COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def compress(content, encoding):
+    engine = compressor(encoding)
+    if encoding == "br":
+        return engine.process(content) + engine.finish()
+    return engine.compress(content) + engine.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Сжимает поток, сбрасывая буфер после каждого куска.
+
+    Так клиент получает начало страницы, не дожидаясь её конца.
+    """
+    engine = compressor(encoding)
+    for chunk in chunks:
+        if encoding == "br":
+            data = engine.process(chunk) + engine.flush()
+        else:
+            data = engine.compress(chunk) + engine.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield engine.finish() if encoding == "br" else engine.flush()
+
+
+class CompressionMiddleware:
+    """Минифицирует HTML и сжимает HTML/JSON ответы gzip или brotli."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if content_type not in settings.COMPRESS_CONTENT_TYPES:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request)
+        if response.streaming:
+            if encoding:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, encoding
+                )
+                del response["Content-Length"]
+                self.set_encoding(response, encoding)
+            return response
+        content = response.content
+        if settings.HTML_MINIFY and content_type == "text/html":
+            content = minify_html(content)
+        if encoding and len(content) >= settings.COMPRESS_MIN_SIZE:
+            compressed = compress(content, encoding)
+            if len(compressed) < len(content):
+                content = compressed
+                self.set_encoding(response, encoding)
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        return response
+
+    def set_encoding(self, response, encoding):
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+
+class RateLimitMiddleware:
+    """Применяет ограничения RATELIMITS по имени маршрута."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        limit = view_limit(view_name)
+        if limit is None:
+            return None
+        return check(
+            request,
+            view_name,
+            limit["limit"],
+            limit["period"],
+            limit.get("methods"),
+        )
@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    name = models.CharField(max_length=100)
+    payload = models.TextField(default="{}")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now, db_index=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_after", "pk"]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk}"
+
+
+class DeadJob(models.Model):
+    name = models.CharField(max_length=100)
+    payload = models.TextField(default="{}")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField()
+    failed = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-failed"]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk}"
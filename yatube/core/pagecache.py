@@ -0,0 +1,122 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .holes import fill_holes
+
+PAGE_CACHE_KEY = "pagecache:{path}:{versions}"
+SHELL_CACHE_KEY = "pageshell:{path}:{versions}"
+
+
+def cache_path(request):
+    """Путь с параметрами из PAGE_CACHE_QUERY_PARAMS в постоянном порядке.
+
+    Остальные параметры страница не читает, и в ключ они не попадают,
+    чтобы произвольные строки запроса не плодили копии в кеше.
+    """
+    params = []
+    for name in sorted(settings.PAGE_CACHE_QUERY_PARAMS):
+        value = request.GET.get(name, "")
+        if value.isdigit():
+            params.append(f"{name}={int(value)}")
+    if not params:
+        return request.path
+    return request.path + "?" + "&".join(params)
+
+
+def page_key(request, versions, template=PAGE_CACHE_KEY):
+    path = hashlib.md5(cache_path(request).encode()).hexdigest()
+    versions = hashlib.md5(repr(tuple(versions)).encode()).hexdigest()
+    return template.format(path=path, versions=versions)
+
+
+def is_cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header("Vary")
+    )
+
+
+def cache_anonymous_page(get_versions):
+    """Кеширует ответ для анонимных GET и HEAD запросов.
+
+    get_versions(request, *args, **kwargs) возвращает версии данных
+    страницы: их изменение делает старую копию недоступной. Страницы,
+    на которых выдан CSRF-токен или установлена cookie, не кешируются.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                not settings.PAGE_CACHE_ENABLED
+                or request.method not in ("GET", "HEAD")
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            key = page_key(request, get_versions(request, *args, **kwargs))
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            response = view(request, *args, **kwargs)
+            if is_cacheable(response) and not request.META.get(
+                "CSRF_COOKIE_USED"
+            ):
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    settings.PAGE_CACHE_TIMEOUT,
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_page_shell(get_versions):
+    """cache_anonymous_page, который обслуживает и вошедших пользователей.
+
+    Страница рендерится один раз как общая оболочка: на месте
+    {% hole %} остаются метки. Оболочка кешируется, а метки заполняются
+    фрагментами текущего пользователя на каждом запросе.
+    """
+    def decorator(view):
+        @wraps(view)
+        def shell_view(request, *args, **kwargs):
+            if (
+                not settings.PAGE_CACHE_ENABLED
+                or request.method not in ("GET", "HEAD")
+            ):
+                return view(request, *args, **kwargs)
+            versions = get_versions(request, *args, **kwargs)
+            key = page_key(request, versions, SHELL_CACHE_KEY)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(
+                    fill_holes(content, request), content_type=content_type
+                )
+            request.punch_holes = True
+            response = view(request, *args, **kwargs)
+            if response.streaming:
+                response.streaming_content = (
+                    fill_holes(chunk, request)
+                    for chunk in response.streaming_content
+                )
+                return response
+            if is_cacheable(response) and not request.META.get(
+                "CSRF_COOKIE_USED"
+            ):
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    settings.PAGE_CACHE_TIMEOUT,
+                )
+            response.content = fill_holes(response.content, request)
+            return response
+        return cache_anonymous_page(get_versions)(shell_view)
+    return decorator
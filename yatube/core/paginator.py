@@ -0,0 +1,112 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+COUNT_CACHE_KEY = "paginator:count:{digest}"
+
+
+def table_estimate(model, using="default"):
+    """Число строк таблицы по статистике планировщика или None.
+
+    PostgreSQL хранит его в pg_class.reltuples, SQLite — первым числом
+    в sqlite_stat1 после ANALYZE. Для других СУБД оценки нет.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    elif connection.vendor == "sqlite":
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+def is_whole_table(queryset):
+    query = queryset.query
+    return (
+        not query.where
+        and not query.distinct
+        and query.low_mark == 0
+        and query.high_mark is None
+    )
+
+
+def count_cache_key(queryset):
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    digest = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+    return COUNT_CACHE_KEY.format(digest=digest)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не считает COUNT(*) по большим выборкам.
+
+    Источники оценки по порядку: переданное count (денормализованный
+    счётчик), статистика планировщика для запроса по всей таблице,
+    сохранённый в кеше точный подсчёт того же запроса. Оценка
+    используется, только если она больше ESTIMATED_COUNT_THRESHOLD;
+    иначе считается точно, и тогда is_estimated ложно.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        count=None,
+    ):
+        super().__init__(
+            object_list, per_page, orphans, allow_empty_first_page
+        )
+        self.count_hint = count
+        self.is_estimated = False
+
+    @cached_property
+    def count(self):
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+        estimate = self.estimate()
+        if estimate is not None and estimate > threshold:
+            self.is_estimated = True
+            return estimate
+        exact = super().count
+        if exact > threshold:
+            key = self.cache_key()
+            if key is not None:
+                cache.set(key, exact, settings.COUNT_CACHE_TIMEOUT)
+        return exact
+
+    def cache_key(self):
+        """Ключ кеша точного подсчёта; составные списки дают свой ключ."""
+        object_list = self.object_list
+        if hasattr(object_list, "count_cache_key"):
+            return object_list.count_cache_key()
+        if hasattr(object_list, "query"):
+            return count_cache_key(object_list)
+        return None
+
+    def estimate(self):
+        if self.count_hint is not None:
+            return self.count_hint
+        queryset = self.object_list
+        if hasattr(queryset, "query") and is_whole_table(queryset):
+            return table_estimate(queryset.model, queryset.db)
+        key = self.cache_key()
+        return cache.get(key) if key is not None else None
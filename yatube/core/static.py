@@ -0,0 +1,86 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+# Имя вида style.0123456789ab.css, которое строит ManifestStaticFilesStorage.
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def parse_accept_encoding(header):
+    """Разбирает Accept-Encoding в словарь {кодировка: q}."""
+    weights = {}
+    for part in header.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    return weights
+
+
+def accepted_encodings(request, codings=("br", "gzip")):
+    """Кодировки из codings, которые клиент принимает (q > 0 или *)."""
+    weights = parse_accept_encoding(
+        request.META.get("HTTP_ACCEPT_ENCODING", "")
+    )
+    return {
+        coding
+        for coding in codings
+        if weights.get(coding, weights.get("*", 0)) > 0
+    }
+
+
+@require_safe
+def serve_static(request, path):
+    """Отдаёт собранную статику, предпочитая заранее сжатые копии."""
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден")
+    if not os.path.isfile(fullpath):
+        raise Http404("Файл не найден")
+    content_type = mimetypes.guess_type(fullpath)[0]
+    encoding = None
+    accepted = accepted_encodings(request)
+    for name, suffix in ENCODINGS:
+        if name in accepted and os.path.isfile(fullpath + suffix):
+            encoding, fullpath = name, fullpath + suffix
+            break
+    stat = os.stat(fullpath)
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"),
+        stat.st_mtime,
+        stat.st_size,
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(fullpath, "rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["Vary"] = "Accept-Encoding"
+    if HASHED_NAME.search(path):
+        max_age, immutable = settings.STATIC_IMMUTABLE_MAX_AGE, ", immutable"
+    else:
+        max_age, immutable = settings.STATIC_MAX_AGE, ""
+    response["Cache-Control"] = f"public, max-age={max_age}{immutable}"
+    return response
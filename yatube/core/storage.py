@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы под именем хеша их содержимого.
+
+    Одинаковые файлы сохраняются один раз: posts/ab/abcdef...gif.
+    Удалять общие файлы можно только когда на них не осталось ссылок.
+    """
+
+    hash_algorithm = "sha256"
+
+    def content_name(self, name, content):
+        digest = hashlib.new(self.hash_algorithm)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        hexdigest = digest.hexdigest()
+        dirname = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        return os.path.join(dirname, hexdigest[:2], f"{hexdigest}{ext}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            try:
+                # Свежее время изменения откладывает удаление общего файла.
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass
+        return self._save(name, content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хеширует имена статики и кладёт рядом сжатые копии .gz и .br.
+
+    Сжатие выполняется в STATICFILES_COMPRESS_WORKERS потоках: zlib и brotli
+    отпускают GIL, так что потоки реально работают параллельно.
+    Brotli используется, только если установлен пакет brotli.
+    """
+
+    compress_extensions = (
+        ".css", ".js", ".svg", ".html", ".txt", ".xml", ".json", ".ico",
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = []
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.append(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        to_compress = [
+            name for name in set(hashed_names)
+            if name.endswith(self.compress_extensions)
+        ]
+        with ThreadPoolExecutor(
+            settings.STATICFILES_COMPRESS_WORKERS
+        ) as executor:
+            list(executor.map(self.compress, to_compress))
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, "rb") as file:
+            content = file.read()
+        compressed = {".gz": gzip.compress(content, compresslevel=9)}
+        if brotli is not None:
+            compressed[".br"] = brotli.compress(content)
+        for suffix, data in compressed.items():
+            if len(data) < len(content):
+                with open(path + suffix, "wb") as file:
+                    file.write(data)
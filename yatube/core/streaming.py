@@ -0,0 +1,33 @@
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_MARKER = "<!--stream-->"
+
+
+def stream_render(
+    request, template_name, context, item_template_name, items, item_name
+):
+    """Отдаёт страницу потоком: шапку сразу, затем элементы по одному.
+
+    Шаблон страницы выводит {{ stream_marker }} вместо цикла по элементам,
+    каждый элемент рендерится отдельно шаблоном item_template_name.
+    Контекст-процессоры выполняются один раз на все элементы.
+    """
+    context = {**context, "stream_marker": mark_safe(STREAM_MARKER)}
+    head, tail = render_to_string(template_name, context, request).split(
+        STREAM_MARKER, 1
+    )
+    item_template = get_template(item_template_name).template
+
+    def stream():
+        yield head
+        item_context = make_context(context, request)
+        with item_context.bind_template(item_template):
+            for index, item in enumerate(items):
+                with item_context.push({item_name: item, "first": not index}):
+                    yield item_template.render(item_context)
+        yield tail
+
+    return StreamingHttpResponse(stream())
@@ -0,0 +1,18 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..holes import placeholder, render_hole
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **args):
+    """Выводит фрагмент name или, в общей оболочке, метку на его месте.
+
+    Аргументы попадают в метку, поэтому должны сериализоваться в JSON.
+    """
+    request = context.get("request")
+    if getattr(request, "punch_holes", False):
+        return mark_safe(placeholder(name, args))
+    return mark_safe(render_hole(request, name, args))
@@ -0,0 +1,49 @@
+import logging
+
+from django import template
+from django.conf import settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from ..images import MIME_TYPES, image_variants
+
+logger = logging.getLogger(__name__)
+
+register = template.Library()
+
+
+def srcset(thumbnails):
+    return ", ".join(f"{thumb.url} {thumb.width}w" for thumb in thumbnails)
+
+
+@register.inclusion_tag("includes/picture.html")
+def responsive_image(image, geometry=None, css_class="card-img my-2"):
+    """Выводит <picture> с WebP/AVIF-вариантами и JPEG по умолчанию."""
+    if not image:
+        return {}
+    geometry = geometry or settings.RESPONSIVE_IMAGE_GEOMETRY
+    try:
+        variants = image_variants(image, geometry)
+        fallback = variants.pop("JPEG")
+        largest = fallback[-1]
+        return {
+            "sources": [
+                {
+                    "type": MIME_TYPES[image_format],
+                    "srcset": srcset(thumbnails),
+                }
+                for image_format, thumbnails in variants.items()
+            ],
+            "src": largest.url,
+            "srcset": srcset(fallback),
+            "sizes": (
+                f"(max-width: {largest.width}px) 100vw, {largest.width}px"
+            ),
+            "width": largest.width,
+            "height": largest.height,
+            "css_class": css_class,
+        }
+    except Exception:
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise
+        logger.exception("Не удалось создать миниатюры для %s", image)
+        return {}
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..holes import HOLE_PATTERN, placeholder
+
+User = get_user_model()
+
+
+class HoleTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.post = Post.objects.create(author=cls.user, text="Тестовый пост")
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    @override_settings(HOLE_PUNCHING_MODE="esi")
+    def test_esi_mode_emits_includes(self):
+        response = self.client.get(
+            reverse("posts:post_detail", args=[self.post.pk])
+        )
+        self.assertContains(response, "<esi:include", count=3)
+        self.assertNotContains(response, "Пользователь: HasNoName")
+        token = HOLE_PATTERN.search(
+            placeholder("core.user_menu", {"view_name": ""}).encode()
+        ).group(1).decode()
+        fragment = self.client.get(reverse("hole"), {"h": token})
+        self.assertContains(fragment, "Пользователь: HasNoName")
+        self.assertIn("no-cache", fragment["Cache-Control"])
+
+    def test_tampered_token_is_rejected(self):
+        response = self.client.get(reverse("hole"), {"h": "core.user_menu"})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from ..checks import shared_cache_check
+from ..jobs import enqueue, extend_lease, job, run_pending
+from ..management.commands.run_workers import work
+from ..models import DeadJob, Job
+from .utils import run_on_commit
+
+calls = []
+
+
+@job("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@job("tests.fail")
+def fail():
+    raise RuntimeError("boom")
+
+
+@job("tests.partial", atomic=False)
+def partial():
+    DeadJob.objects.create(
+        name="tests.partial", payload="{}", created=timezone.now()
+    )
+    raise RuntimeError("boom")
+
+
+@job("tests.long", atomic=False)
+def long_running(steal):
+    if steal:
+        Job.objects.update(locked_until=timezone.now() + timedelta(days=1))
+    # Воркер проработал 45 секунд из 60 захваченных.
+    later = timezone.now() + timedelta(seconds=45)
+    with mock.patch("core.jobs.timezone.now", return_value=later):
+        extend_lease()
+    calls.append(Job.objects.get().locked_until - later)
+
+
+@override_settings(JOBS_ALWAYS_EAGER=False, JOBS_MAX_ATTEMPTS=2)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_job_runs_once_in_worker(self):
+        with run_on_commit():
+            enqueue("tests.record", value=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(run_pending(), 0)
+
+    def test_failed_job_is_retried_then_dead_lettered(self):
+        with run_on_commit():
+            enqueue("tests.fail")
+        run_pending()
+        failed = Job.objects.get()
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.run_after, timezone.now())
+        Job.objects.update(run_after=timezone.now())
+        run_pending()
+        self.assertFalse(Job.objects.exists())
+        dead = DeadJob.objects.get()
+        self.assertEqual(dead.name, "tests.fail")
+        self.assertIn("boom", dead.last_error)
+
+    def test_non_atomic_job_keeps_finished_work(self):
+        with run_on_commit():
+            enqueue("tests.partial")
+        run_pending()
+        self.assertTrue(DeadJob.objects.filter(name="tests.partial").exists())
+        self.assertEqual(Job.objects.get().attempts, 1)
+
+    def test_long_job_extends_its_lease(self):
+        with run_on_commit():
+            enqueue("tests.long", steal=False)
+        run_pending()
+        self.assertEqual(calls, [timedelta(seconds=60)])
+        self.assertFalse(Job.objects.exists())
+
+    def test_job_stops_when_lease_is_taken(self):
+        with run_on_commit():
+            enqueue("tests.long", steal=True)
+        run_pending()
+        self.assertEqual(calls, [])
+        stolen = Job.objects.get()
+        self.assertEqual(stolen.attempts, 0)
+        self.assertGreater(
+            stolen.locked_until, timezone.now() + timedelta(hours=1)
+        )
+
+    @override_settings(JOBS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with run_on_commit():
+            enqueue("tests.record", value=2)
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [2])
+        self.assertFalse(Job.objects.exists())
+
+
+WORKERS = "core.management.commands.run_workers"
+
+
+@mock.patch(f"{WORKERS}.close_old_connections")
+@mock.patch(f"{WORKERS}.time.sleep")
+class WorkerLoopTests(SimpleTestCase):
+    def test_worker_survives_queue_errors(self, sleep, close):
+        errors = [OperationalError("database is locked"), 1, SystemExit]
+        with mock.patch(f"{WORKERS}.run_pending", side_effect=errors) as run:
+            with self.assertLogs(WORKERS, "ERROR"):
+                with self.assertRaises(SystemExit):
+                    work(10, 0.5)
+        self.assertEqual(run.call_count, 3)
+        sleep.assert_called_once_with(0.5)
+        close.assert_called_once_with()
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_local_cache_with_workers_warns(self):
+        self.assertEqual(
+            [warning.id for warning in shared_cache_check(None)],
+            ["core.W001"],
+        )
+
+    @override_settings(JOBS_ALWAYS_EAGER=True)
+    def test_eager_jobs_need_no_shared_cache(self):
+        self.assertEqual(shared_cache_check(None), [])
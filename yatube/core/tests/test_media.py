@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ServeMediaTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.name = default_storage.save(
+            "posts/photo.jpg", ContentFile(b"0123456789")
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_hashed_file_is_immutable(self):
+        response = self.client.get(f"/media/{self.name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range_request(self):
+        response = self.client.get(
+            f"/media/{self.name}", HTTP_RANGE="bytes=2-5"
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+
+    @override_settings(MEDIA_SENDFILE_BACKEND="x-accel-redirect")
+    def test_transfer_is_delegated_to_proxy(self):
+        response = self.client.get(f"/media/{self.name}")
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.name}"
+        )
+        self.assertEqual(response.content, b"")
+
+    def test_proxy_paths_are_url_quoted(self):
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, "posts"), exist_ok=True)
+        with open(os.path.join(TEMP_MEDIA_ROOT, "posts", "фото.jpg"), "wb"):
+            pass
+        with self.settings(MEDIA_SENDFILE_BACKEND="x-accel-redirect"):
+            response = self.client.get("/media/posts/фото.jpg")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/protected-media/posts/%D1%84%D0%BE%D1%82%D0%BE.jpg",
+        )
+        with self.settings(MEDIA_SENDFILE_BACKEND="x-sendfile"):
+            response = self.client.get("/media/posts/фото.jpg")
+        self.assertTrue(
+            response["X-Sendfile"].endswith(
+                "/posts/%D1%84%D0%BE%D1%82%D0%BE.jpg"
+            )
+        )
+
+    def test_missing_file(self):
+        response = self.client.get("/media/posts/missing.jpg")
+        self.assertEqual(response.status_code, 404)
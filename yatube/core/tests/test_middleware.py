@@ -0,0 +1,67 @@
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..middleware import CompressionMiddleware, minify_html
+
+HTML = (
+    b"<html>\n    <body>\n" + b"      <p>   text   </p>\n" * 100
+    + b"<textarea>  keep\n   this  </textarea>\n  </body>\n</html>"
+)
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, **headers):
+        request = self.factory.get("/", **headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_minify_keeps_protected_blocks(self):
+        minified = minify_html(HTML)
+        self.assertIn(b"<textarea>  keep\n   this  </textarea>", minified)
+        self.assertIn(b"\n<p> text </p>\n", minified)
+
+    def test_html_is_minified_and_gzipped(self):
+        response = self.process(
+            HttpResponse(HTML), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), minify_html(HTML))
+        self.assertEqual(
+            response["Content-Length"], str(len(response.content))
+        )
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_refused_encodings_are_not_used(self):
+        response = self.process(
+            HttpResponse(HTML), HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response = self.process(
+            HttpResponse(HTML), HTTP_ACCEPT_ENCODING="br;q=0, gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    @override_settings(COMPRESS_MIN_SIZE=10 ** 6)
+    def test_small_response_is_not_compressed(self):
+        response = self.process(
+            HttpResponse(HTML), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_already_encoded_response_is_skipped(self):
+        original = HttpResponse(HTML)
+        original["Content-Encoding"] = "gzip"
+        response = self.process(original, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.content, HTML)
+
+    def test_streaming_response_is_compressed(self):
+        chunks = [b"<p>first</p>", b"<p>second</p>"]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks)), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), b"".join(chunks))
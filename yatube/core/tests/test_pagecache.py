@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+from ..pagecache import cache_anonymous_page
+
+User = get_user_model()
+
+
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.post = Post.objects.create(author=cls.user, text="Тестовый пост")
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_anonymous_page_is_served_from_cache(self):
+        url = reverse("posts:post_detail", args=[self.post.pk])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, "Тестовый пост")
+        self.assertIsNone(response.context)
+
+    def test_content_changes_invalidate_page(self):
+        detail = reverse("posts:post_detail", args=[self.post.pk])
+        index = reverse("posts:index")
+        self.client.get(detail)
+        Comment.objects.create(author=self.user, post=self.post, text="Ок")
+        self.assertContains(self.client.get(detail), "Ок")
+        self.client.get(index)
+        Group.objects.create(title="Новая", slug="new", description="-")
+        self.assertIsNotNone(self.client.get(index).context)
+
+    def test_unrelated_post_keeps_detail_cached(self):
+        url = reverse("posts:post_detail", args=[self.post.pk])
+        self.client.get(url)
+        other = User.objects.create_user(username="other")
+        Post.objects.create(author=other, text="Чужой пост")
+        self.assertIsNone(self.client.get(url).context)
+        Post.objects.create(author=self.user, text="Ещё пост")
+        self.assertIsNotNone(self.client.get(url).context)
+
+    def test_query_string_is_normalised(self):
+        url = reverse("posts:index")
+        self.client.get(url, {"page": "01"})
+        with self.assertNumQueries(0):
+            self.client.get(url, {"page": "1", "utm_source": "x"})
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url, {"junk": "1", "page": "x"})
+
+    def test_authenticated_users_share_page_shell(self):
+        url = reverse("posts:post_detail", args=[self.post.pk])
+        self.client.get(url)
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertTemplateNotUsed(response, "posts/post_detail.html")
+        self.assertContains(response, "Пользователь: HasNoName")
+        self.assertContains(response, "редактировать пост")
+        self.assertContains(response, "csrfmiddlewaretoken")
+        other = User.objects.create_user(username="other")
+        self.client.force_login(other)
+        response = self.client.get(url)
+        self.assertContains(response, "Пользователь: other")
+        self.assertNotContains(response, "редактировать пост")
+
+    def test_page_with_csrf_token_is_not_cached(self):
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            return HttpResponse(get_token(request))
+
+        cached_view = cache_anonymous_page(lambda request: [1])(view)
+        for _ in range(2):
+            request = RequestFactory().get("/form/")
+            request.user = AnonymousUser()
+            cached_view(request)
+        self.assertEqual(len(calls), 2)
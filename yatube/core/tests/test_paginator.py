@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Post
+
+from ..paginator import EstimatedCountPaginator, table_estimate
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_superuser(
+            "admin", "admin@example.com", "password"
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f"Пост {i}") for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_whole_table_uses_planner_estimate(self):
+        self.analyze()
+        Post.objects.filter(pk=Post.objects.first().pk).delete()
+        self.assertEqual(table_estimate(Post), 3)
+        paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(paginator.count, 3)
+        filtered = EstimatedCountPaginator(
+            Post.objects.filter(author=self.user), 2
+        )
+        self.assertEqual(filtered.count, 2)
+
+    def test_small_table_is_counted_exactly(self):
+        self.analyze()
+        Post.objects.filter(pk=Post.objects.first().pk).delete()
+        paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(paginator.count, 2)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_filtered_count_is_cached(self):
+        posts = Post.objects.filter(author=self.user)
+        self.assertEqual(EstimatedCountPaginator(posts, 2).count, 3)
+        Post.objects.filter(pk=Post.objects.first().pk).delete()
+        paginator = EstimatedCountPaginator(posts, 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.is_estimated)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=100)
+    def test_count_hint_above_threshold(self):
+        posts = Post.objects.filter(author=self.user)
+        paginator = EstimatedCountPaginator(posts, 2, count=1000)
+        self.assertEqual(paginator.count, 1000)
+        self.assertTrue(paginator.is_estimated)
+        paginator = EstimatedCountPaginator(posts, 2, count=50)
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.is_estimated)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_profile_shows_approximate_count(self):
+        url = reverse("posts:profile", args=[self.user.username])
+        self.assertNotContains(self.client.get(url), "около")
+        Post.objects.filter(pk=Post.objects.first().pk).delete()
+        response = self.client.get(url)
+        self.assertContains(response, "около")
+        self.assertEqual(response.context["page_obj"].paginator.count, 3)
+
+    def test_admin_changelists(self):
+        post = Post.objects.first()
+        Comment.objects.create(author=self.user, post=post, text="Ок")
+        Follow.objects.create(
+            user=self.user, author=User.objects.create_user("author")
+        )
+        self.client.force_login(self.user)
+        for model in ("post", "comment", "follow"):
+            with self.subTest(model=model):
+                response = self.client.get(
+                    reverse(f"admin:posts_{model}_changelist")
+                )
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..ratelimit import RATELIMIT_CACHE_KEY, client_ip, hit, ratelimit
+
+User = get_user_model()
+
+LIMITS = {"posts:profile_follow": {"limit": 2, "period": 3600}}
+
+
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.author = User.objects.create_user(username="author")
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_decorator_limits_per_client(self):
+        view = ratelimit(2, 3600)(lambda request: HttpResponse("ok"))
+        request = self.factory.post("/", REMOTE_ADDR="10.0.0.1")
+        request.user = AnonymousUser()
+        statuses = [view(request).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        response = view(request)
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 2 * 3600)
+        other = self.factory.post("/", REMOTE_ADDR="10.0.0.2")
+        other.user = AnonymousUser()
+        self.assertEqual(view(other).status_code, 200)
+
+    def test_no_double_burst_across_window_boundary(self):
+        # Период длиннее эпохи Unix: окно 0 ещё идёт, окно -1 — прошлое.
+        period = 10 ** 10
+        cache.set(
+            RATELIMIT_CACHE_KEY.format(scope="s", client="c", window=-1), 10
+        )
+        passed = sum(hit("s", "c", 10, period) is None for _ in range(10))
+        self.assertGreaterEqual(passed, 1)
+        self.assertLess(passed, 5)
+
+    def test_cache_round_trips(self):
+        hit("s", "c", 2, 3600)
+        names = ("get_many", "incr", "add", "decr")
+        patches = [
+            mock.patch.object(cache, name, wraps=getattr(cache, name))
+            for name in names
+        ]
+        mocks = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        def calls():
+            counts = [method.call_count for method in mocks]
+            for method in mocks:
+                method.reset_mock()
+            return dict(zip(names, counts))
+
+        self.assertIsNone(hit("s", "c", 2, 3600))
+        self.assertEqual(
+            calls(), {"get_many": 1, "incr": 1, "add": 0, "decr": 0}
+        )
+        self.assertIsNotNone(hit("s", "c", 2, 3600))
+        self.assertEqual(
+            calls(), {"get_many": 1, "incr": 0, "add": 0, "decr": 0}
+        )
+
+    @override_settings(RATELIMIT_PROXY_COUNT=1)
+    def test_client_ip_behind_proxy(self):
+        request = self.factory.get(
+            "/",
+            REMOTE_ADDR="10.0.0.254",
+            HTTP_X_FORWARDED_FOR="6.6.6.6, 203.0.113.7",
+        )
+        self.assertEqual(client_ip(request), "203.0.113.7")
+        direct = self.factory.get("/", REMOTE_ADDR="203.0.113.8")
+        self.assertEqual(client_ip(direct), "203.0.113.8")
+
+    def test_decorator_skips_other_methods(self):
+        view = ratelimit(1, 3600, methods=["POST"])(
+            lambda request: HttpResponse("ok")
+        )
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+        for _ in range(3):
+            self.assertEqual(view(request).status_code, 200)
+
+    @override_settings(RATELIMITS=LIMITS)
+    def test_middleware_limits_configured_view(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse("posts:profile_follow", args=[self.author.username])
+        statuses = [client.get(url).status_code for _ in range(3)]
+        self.assertEqual(statuses, [302, 302, 429])
+        self.assertIn("Retry-After", client.get(url))
+        self.assertEqual(client.get(reverse("posts:index")).status_code, 200)
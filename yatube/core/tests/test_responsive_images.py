@@ -0,0 +1,43 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ResponsiveImageTagTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def render(self, image):
+        template = Template(
+            "{% load responsive_images %}{% responsive_image image %}"
+        )
+        return template.render(Context({"image": image}))
+
+    def test_picture_markup(self):
+        output = BytesIO()
+        Image.new("RGB", (1200, 800), "white").save(output, "JPEG")
+        name = default_storage.save("posts/photo.jpg", ContentFile(
+            output.getvalue()
+        ))
+        html = self.render(default_storage.open(name))
+        self.assertIn("<picture>", html)
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertIn('width="960" height="339"', html)
+        for width in settings.RESPONSIVE_IMAGE_WIDTHS:
+            self.assertIn(f" {width}w", html)
+
+    def test_empty_image_renders_nothing(self):
+        self.assertEqual(self.render(None).strip(), "")
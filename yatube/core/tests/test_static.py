@@ -0,0 +1,75 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..static import accepted_encodings
+
+TEMP_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SOURCE_DIR = os.path.join(TEMP_DIR, "static")
+STATIC_ROOT = os.path.join(TEMP_DIR, "collected")
+CSS = b"body { color: red; }\n" * 100
+
+
+@override_settings(
+    STATICFILES_DIRS=[SOURCE_DIR],
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE="core.storage.CompressedManifestStaticFilesStorage",
+)
+class CompressedStaticTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(SOURCE_DIR, "css"))
+        with open(os.path.join(SOURCE_DIR, "css", "site.css"), "wb") as f:
+            f.write(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def setUp(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        self.hashed_name = staticfiles_storage.stored_name("css/site.css")
+
+    def test_collectstatic_writes_gzip_sibling(self):
+        path = os.path.join(STATIC_ROOT, self.hashed_name)
+        with open(path + ".gz", "rb") as file:
+            self.assertEqual(gzip.decompress(file.read()), CSS)
+
+    def test_precompressed_file_is_served(self):
+        response = self.client.get(
+            f"/static/{self.hashed_name}", HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertIn("immutable", response["Cache-Control"])
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_identity_without_accept_encoding(self):
+        response = self.client.get(f"/static/{self.hashed_name}")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(b"".join(response.streaming_content), CSS)
+
+
+class AcceptEncodingTests(TestCase):
+    def accepted(self, header):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=header)
+        return accepted_encodings(request)
+
+    def test_q_values_are_parsed(self):
+        self.assertEqual(self.accepted("gzip;q=0.5, br"), {"br", "gzip"})
+        self.assertEqual(self.accepted("gzip, br; q=0.0"), {"gzip"})
+        self.assertEqual(self.accepted("br;q=0.000, gzip;Q=0"), set())
+
+    def test_wildcard(self):
+        self.assertEqual(self.accepted("*"), {"br", "gzip"})
+        self.assertEqual(self.accepted("gzip;q=0, *"), {"br"})
+        self.assertEqual(self.accepted("identity"), set())
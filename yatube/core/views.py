@@ -1,4 +1,9 @@
+from django.core.signing import BadSignature
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
+
+from .holes import load_token, render_hole
 
 
 def page_not_found(request, exception):
@@ -15,3 +20,15 @@ def permission_denied_view(request, exception):
 
 def csrf_failure(request, reason=""):
     return render(request, "core/403csrf.html")
+
+
+def hole_fragment(request):
+    """Фрагмент для <esi:include>, см. core.holes."""
+    try:
+        name, args = load_token(request.GET.get("h", ""))
+    except BadSignature:
+        raise Http404("Неизвестный фрагмент")
+    response = HttpResponse(render_hole(request, name, args))
+    add_never_cache_headers(response)
+    patch_vary_headers(response, ("Cookie",))
+    return response
@@ -1,9 +1,20 @@
+from django.conf import settings
 from django.contrib import admin
 
+from core.jobs import enqueue
+from core.paginator import EstimatedCountPaginator
+
 from .models import Comment, Follow, Group, Post
 
 
-class PostAdmin(admin.ModelAdmin):
+class LargeTableAdmin(admin.ModelAdmin):
+    """Список без полного COUNT(*) и без загрузки связанных объектов."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class PostAdmin(LargeTableAdmin):
     list_display = (
         "pk",
         "text",
@@ -11,13 +22,43 @@ class PostAdmin(admin.ModelAdmin):
         "author",
         "group",
     )
+    list_select_related = ("author", "group")
+    raw_id_fields = ("author", "group")
     search_fields = ("text",)
     list_filter = ("pub_date",)
+    date_hierarchy = "pub_date"
     empty_value_display = "-пусто-"
     list_editable = ("group",)
+    actions = ["delete_in_background"]
+
+    def delete_in_background(self, request, queryset):
+        post_ids = list(queryset.values_list("pk", flat=True))
+        size = settings.DELETION_BATCH_SIZE
+        for start in range(0, len(post_ids), size):
+            batch = post_ids[start:start + size]
+            enqueue("posts.delete_posts", post_ids=batch)
+        self.message_user(
+            request, f"Поставлено в очередь на удаление: {len(post_ids)}"
+        )
+
+    delete_in_background.short_description = "Удалить в фоне"
+
+
+class CommentAdmin(LargeTableAdmin):
+    list_display = ("pk", "text", "created", "author", "post")
+    list_select_related = ("author", "post")
+    raw_id_fields = ("author", "post")
+    search_fields = ("text",)
+    date_hierarchy = "created"
+
+
+class FollowAdmin(LargeTableAdmin):
+    list_display = ("pk", "user", "author")
+    list_select_related = ("user", "author")
+    raw_id_fields = ("user", "author")
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
-admin.site.register(Follow)
-admin.site.register(Comment)
+admin.site.register(Follow, FollowAdmin)
+admin.site.register(Comment, CommentAdmin)
@@ -0,0 +1,137 @@
+import json
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from core.auth import basic_auth_user
+from core.jobs import enqueue
+
+from . import stats
+from .caches import bump_feed_versions, get_groups
+from .models import Post
+
+IMAGE_NAME = re.compile(r"^posts/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+def validate_posts(items):
+    """Проверяет пачку целиком; возвращает (посты, ошибки по индексам).
+
+    Группы берутся из кешированного справочника, картинки — ссылки на
+    уже загруженные файлы хранилища.
+    """
+    groups = {group.slug: group for group in get_groups()}
+    posts = []
+    errors = {}
+    for index, item in enumerate(items):
+        item_errors = {}
+        if not isinstance(item, dict):
+            errors[index] = {"__all__": ["Ожидается объект"]}
+            continue
+        text = item.get("text")
+        if not isinstance(text, str) or not text.strip():
+            item_errors["text"] = ["Обязательное поле"]
+        group = None
+        slug = item.get("group")
+        if slug is not None:
+            if not isinstance(slug, str):
+                item_errors["group"] = ["Ожидается slug группы"]
+            else:
+                group = groups.get(slug)
+                if group is None:
+                    item_errors["group"] = [f"Группа {slug} не найдена"]
+        image = item.get("image") or ""
+        if image and not (
+            isinstance(image, str)
+            and IMAGE_NAME.match(image)
+            and default_storage.exists(image)
+        ):
+            item_errors["image"] = ["Картинка не найдена в хранилище"]
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        posts.append(Post(text=text, group=group, image=image))
+    return posts, errors
+
+
+@csrf_exempt
+@require_POST
+def post_batch(request):
+    """Создаёт пачку постов: {"posts": [{"text", "group", "image"}, ...]}.
+
+    Доступ по HTTP Basic, поэтому CSRF не нужен. Пачка создаётся
+    целиком или не создаётся вовсе.
+    """
+    user = basic_auth_user(request)
+    if user is None:
+        response = JsonResponse({"error": "Нужна авторизация"}, status=401)
+        response["WWW-Authenticate"] = 'Basic realm="yatube"'
+        return response
+    try:
+        items = json.loads(request.body)["posts"]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse(
+            {"error": "Ожидается объект с полем posts"}, status=400
+        )
+    if not isinstance(items, list) or not items:
+        return JsonResponse({"error": "Пустая пачка"}, status=400)
+    if len(items) > settings.POST_BATCH_MAX_SIZE:
+        return JsonResponse(
+            {"error": f"Не больше {settings.POST_BATCH_MAX_SIZE} постов"},
+            status=400,
+        )
+    posts, errors = validate_posts(items)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    created = create_posts(posts, user)
+    return JsonResponse(
+        {"created": len(created), "ids": [post.pk for post in created]},
+        status=201,
+    )
+
+
+def create_posts(posts, author):
+    """Вставляет проверенные посты одним bulk_create в транзакции.
+
+    Счётчики групп, версии лент и задача на варианты картинок
+    обновляются один раз на пачку, а не на каждый пост.
+    """
+    for post in posts:
+        post.author = author
+    with transaction.atomic():
+        created = Post.objects.bulk_create(posts)
+        if any(post.pk is None for post in created):
+            _fill_ids(created, author)
+        for group_id, count in Counter(
+            post.group_id for post in created if post.group_id
+        ).items():
+            stats.posts_added(group_id, count)
+    scopes = {"all", f"author:{author.username}"}
+    scopes.update(
+        f"group:{post.group_id}" for post in created if post.group_id
+    )
+    bump_feed_versions(scopes)
+    with_images = [post.pk for post in created if post.image]
+    if with_images:
+        enqueue("posts.generate_batch_image_variants", post_ids=with_images)
+    return created
+
+
+def _fill_ids(posts, author):
+    """Проставляет id, если база не вернула их из bulk_create (SQLite).
+
+    До конца транзакции база заблокирована на запись, поэтому последние
+    len(posts) постов автора — только что вставленные, в том же порядке.
+    """
+    ids = (
+        Post.objects.filter(author=author)
+        .order_by("-pk")
+        .values_list("pk", flat=True)[:len(posts)]
+    )
+    for post, pk in zip(posts, reversed(list(ids))):
+        post.pk = pk
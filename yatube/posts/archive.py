@@ -0,0 +1,130 @@
+import hashlib
+
+from django.db import transaction
+
+from core.db import raw_delete
+from core.paginator import COUNT_CACHE_KEY, count_cache_key
+
+from .caches import bump_feed_versions
+from .models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    GroupStats,
+    Post,
+    TrendingBucket,
+    TrendingScore,
+)
+
+POST_FIELDS = ["id", "text", "pub_date", "author_id", "group_id", "image"]
+COMMENT_FIELDS = ["id", "text", "created", "author_id", "post_id"]
+
+
+def archive_batch(cutoff, batch_size):
+    """Переносит до batch_size постов старше cutoff вместе с комментариями.
+
+    Каждая пачка — отдельная транзакция, поэтому прерванный перенос
+    продолжается повторным запуском. Возвращает число перенесённых постов.
+    """
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(pub_date__lt=cutoff)
+            .order_by("pk")
+            .values(*POST_FIELDS, "author__username")[:batch_size]
+        )
+        if not posts:
+            return 0
+        ids = [post["id"] for post in posts]
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(**{field: post[field] for field in POST_FIELDS})
+            for post in posts
+        )
+        comments = Comment.objects.filter(post_id__in=ids)
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**values)
+            for values in comments.values(*COMMENT_FIELDS).iterator()
+        )
+        raw_delete(comments)
+        raw_delete(TrendingBucket.objects.filter(post_id__in=ids))
+        raw_delete(TrendingScore.objects.filter(post_id__in=ids))
+        GroupStats.objects.filter(latest_post_id__in=ids).update(
+            latest_post=None
+        )
+        raw_delete(Post.objects.filter(pk__in=ids))
+    scopes = {"all"}
+    for post in posts:
+        scopes.add(f"author:{post['author__username']}")
+        scopes.add(f"post:{post['id']}")
+        if post["group_id"] is not None:
+            scopes.add(f"group:{post['group_id']}")
+    bump_feed_versions(scopes)
+    return len(posts)
+
+
+def archive_posts(cutoff, batch_size):
+    total = 0
+    while True:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            return total
+        total += moved
+
+
+class ChainedPosts:
+    """Последовательность из двух запросов подряд для Paginator.
+
+    Нужна профилю и группе: сначала посты из Post, затем из архива.
+    Первая часть считается через COUNT только для страниц целиком
+    за её концом, поэтому оценка Paginator не теряется на горячих
+    страницах.
+    """
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def count(self):
+        return self._first_count() + self.second.count()
+
+    def __len__(self):
+        return self.count()
+
+    def count_cache_key(self):
+        keys = [count_cache_key(self.first), count_cache_key(self.second)]
+        if None in keys:
+            return None
+        digest = hashlib.md5("".join(keys).encode()).hexdigest()
+        return COUNT_CACHE_KEY.format(digest=digest)
+
+    def _first_count(self):
+        if not hasattr(self, "_first_total"):
+            self._first_total = self.first.count()
+        return self._first_total
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop = item.start or 0, item.stop
+        result = list(self.first[start:stop])
+        if len(result) == stop - start:
+            return result
+        # Страница дошла до конца первой части. Её длина известна без
+        # COUNT, если на странице есть хоть одна её строка.
+        if result or not start:
+            self._first_total = start + len(result)
+        split = self._first_count()
+        result.extend(self.second[max(start - split, 0):stop - split])
+        return result
+
+
+def get_post_or_archived(post_id):
+    """Возвращает (post, archived) или (None, False)."""
+    post = Post.objects.select_related("author", "group").filter(
+        pk=post_id
+    ).first()
+    if post is not None:
+        return post, False
+    post = ArchivedPost.objects.select_related("author", "group").filter(
+        pk=post_id
+    ).first()
+    return post, post is not None
@@ -0,0 +1,138 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .models import ArchivedPost, Comment, Follow, Group, Post
+
+GROUPS_CACHE_KEY = "posts:groups"
+FOLLOWING_CACHE_KEY = "posts:following:{user_id}"
+COMMENTS_CACHE_KEY = "posts:comments:{post_id}"
+FEED_VERSION_CACHE_KEY = "posts:feed_version:{scope}"
+POST_AUTHOR_CACHE_KEY = "posts:author:{post_id}"
+
+
+def _get_group_registry():
+    """Возвращает словарь {slug: группа}, закешированный целиком."""
+    registry = cache.get(GROUPS_CACHE_KEY)
+    if registry is None:
+        registry = {
+            group.slug: group for group in Group.objects.order_by("pk")
+        }
+        cache.set(GROUPS_CACHE_KEY, registry, settings.GROUPS_CACHE_TIMEOUT)
+    return registry
+
+
+def get_groups():
+    return list(_get_group_registry().values())
+
+
+def get_group_or_404(slug):
+    group = _get_group_registry().get(slug)
+    if group is None:
+        raise Http404(f"Группа {slug} не найдена")
+    return group
+
+
+def get_group_choices():
+    choices = [("", "---------")]
+    choices.extend((group.pk, group.title) for group in get_groups())
+    return choices
+
+
+def invalidate_groups():
+    cache.delete(GROUPS_CACHE_KEY)
+
+
+def get_following_ids(user):
+    """Возвращает множество id авторов, на которых подписан user."""
+    key = FOLLOWING_CACHE_KEY.format(user_id=user.pk)
+    following = cache.get(key)
+    if following is None:
+        following = frozenset(
+            Follow.objects.filter(user=user).values_list(
+                "author_id", flat=True
+            )
+        )
+        cache.set(key, following, settings.FOLLOWING_CACHE_TIMEOUT)
+    return following
+
+
+def is_following(user, authors):
+    """Возвращает {id автора: подписан ли user} для всех authors сразу."""
+    if not user.is_authenticated:
+        return {author.pk: False for author in authors}
+    following = get_following_ids(user)
+    return {author.pk: author.pk in following for author in authors}
+
+
+def invalidate_following(user_id):
+    cache.delete(FOLLOWING_CACHE_KEY.format(user_id=user_id))
+
+
+def get_comments(post_id):
+    key = COMMENTS_CACHE_KEY.format(post_id=post_id)
+    comments = cache.get(key)
+    if comments is None:
+        comments = list(
+            Comment.objects.filter(post_id=post_id).select_related("author")
+        )
+        cache.set(key, comments, settings.COMMENTS_CACHE_TIMEOUT)
+    return comments
+
+
+def invalidate_comments(post_id):
+    cache.delete(COMMENTS_CACHE_KEY.format(post_id=post_id))
+
+
+def get_post_author(post_id):
+    """Имя автора поста, в том числе архивного, или пустая строка.
+
+    Автор у поста не меняется, поэтому значение кешируется без срока.
+    """
+    key = POST_AUTHOR_CACHE_KEY.format(post_id=post_id)
+    username = cache.get(key)
+    if username is None:
+        username = ""
+        for model in (Post, ArchivedPost):
+            found = model.objects.filter(pk=post_id).values_list(
+                "author__username", flat=True
+            ).first()
+            if found is not None:
+                username = found
+                cache.set(key, username, None)
+                break
+    return username
+
+
+def get_feed_version(scope):
+    """Возвращает время последнего изменения постов в ленте scope."""
+    key = FEED_VERSION_CACHE_KEY.format(scope=scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time()
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def get_feed_versions(*scopes):
+    """Версии нескольких областей за одно обращение к кешу."""
+    keys = [FEED_VERSION_CACHE_KEY.format(scope=scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time(), None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def bump_feed_versions(scopes):
+    version = time.time()
+    cache.set_many(
+        {FEED_VERSION_CACHE_KEY.format(scope=scope): version
+         for scope in scopes},
+        None,
+    )
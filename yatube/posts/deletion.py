@@ -0,0 +1,203 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from core.db import raw_delete
+from core.jobs import enqueue, extend_lease
+from users.backends import invalidate_user
+
+from . import stats
+from .caches import (
+    bump_feed_versions,
+    invalidate_comments,
+    invalidate_following,
+)
+from .models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    GroupStats,
+    Post,
+    Recommendation,
+    TrendingBucket,
+    TrendingScore,
+    User,
+)
+from .trending import current_bucket
+
+
+def delete_posts(post_ids, batch_size=None):
+    """Удаляет посты пачками без загрузки объектов и сигналов на строку.
+
+    Комментарии и строки рейтинга удаляются отдельными DELETE, счётчики
+    GroupStats правятся одним UPDATE на группу, а файлы картинок
+    освобождает задача posts.release_image. Возвращает число постов.
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    post_ids = list(post_ids)
+    deleted = 0
+    for start in range(0, len(post_ids), batch_size):
+        deleted += _delete_post_batch(post_ids[start:start + batch_size])
+        extend_lease()
+    return deleted
+
+
+def _delete_post_batch(post_ids):
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(pk__in=post_ids).values(
+                "id", "image", "group_id", "author__username"
+            )
+        )
+        if not posts:
+            return 0
+        ids = [post["id"] for post in posts]
+        raw_delete(Comment.objects.filter(post_id__in=ids))
+        raw_delete(TrendingBucket.objects.filter(post_id__in=ids))
+        raw_delete(TrendingScore.objects.filter(post_id__in=ids))
+        GroupStats.objects.filter(latest_post_id__in=ids).update(
+            latest_post=None
+        )
+        raw_delete(Post.objects.filter(pk__in=ids))
+        for group_id in _decrement_group_counts(
+            post["group_id"] for post in posts
+        ):
+            stats.refresh_latest(group_id)
+    scopes = {"all"}
+    for post in posts:
+        scopes.add(f"author:{post['author__username']}")
+        scopes.add(f"post:{post['id']}")
+        if post["group_id"]:
+            scopes.add(f"group:{post['group_id']}")
+    bump_feed_versions(scopes)
+    release_images(post["image"] for post in posts)
+    return len(posts)
+
+
+def _decrement_group_counts(group_ids):
+    """Вычитает удалённые посты из GroupStats; возвращает id групп."""
+    per_group = Counter(group_id for group_id in group_ids if group_id)
+    for group_id, count in per_group.items():
+        GroupStats.objects.filter(group_id=group_id).update(
+            post_count=Greatest(F("post_count") - count, 0)
+        )
+    return list(per_group)
+
+
+def release_images(names):
+    for image_name in {name for name in names if name}:
+        enqueue("posts.release_image", image_name=image_name)
+
+
+def delete_user(user_id, batch_size=None):
+    """Удаляет пользователя и всё, что от него зависит, пачками.
+
+    Каждая пачка фиксируется отдельно, поэтому вызов нельзя оборачивать
+    в общую транзакцию; повторный вызов продолжает с того места,
+    где остановился прошлый.
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    User.objects.filter(pk=user_id).update(is_active=False)
+    invalidate_user(user_id)
+
+    _delete_relations(user_id, batch_size)
+
+    while _delete_comment_batch(user_id, batch_size):
+        extend_lease()
+    for _ in _delete_batches(
+        ArchivedComment.objects.filter(author_id=user_id), batch_size
+    ):
+        pass
+    while True:
+        ids = list(
+            Post.objects.filter(author_id=user_id).values_list(
+                "pk", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            break
+        _delete_post_batch(ids)
+        extend_lease()
+    while True:
+        archived = list(
+            ArchivedPost.objects.filter(author_id=user_id).values_list(
+                "pk", "image", "group_id"
+            )[:batch_size]
+        )
+        if not archived:
+            break
+        ids = [pk for pk, _, _ in archived]
+        with transaction.atomic():
+            raw_delete(ArchivedComment.objects.filter(post_id__in=ids))
+            raw_delete(ArchivedPost.objects.filter(pk__in=ids))
+            _decrement_group_counts(
+                group_id for _, _, group_id in archived
+            )
+        release_images(image for _, image, _ in archived)
+        extend_lease()
+
+    # Остались только мелкие зависимости вроде записей журнала админки.
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        user.delete()
+
+
+def _delete_relations(user_id, batch_size):
+    """Удаляет подписки и рекомендации пользователя в обе стороны."""
+    invalidate_following(user_id)
+    for rows in _delete_batches(
+        Follow.objects.filter(Q(user_id=user_id) | Q(author_id=user_id)),
+        batch_size,
+        "user_id",
+    ):
+        for follower_id in {follower_id for _, follower_id in rows}:
+            invalidate_following(follower_id)
+    for _ in _delete_batches(
+        Recommendation.objects.filter(
+            Q(user_id=user_id) | Q(author_id=user_id)
+        ),
+        batch_size,
+    ):
+        pass
+
+
+def _delete_batches(queryset, batch_size, *fields):
+    """Удаляет строки queryset пачками по первичному ключу.
+
+    Для каждой пачки отдаёт кортежи (pk, *fields) удалённых строк.
+    """
+    while True:
+        rows = list(queryset.values_list("pk", *fields)[:batch_size])
+        if not rows:
+            return
+        raw_delete(
+            queryset.model.objects.filter(pk__in=[row[0] for row in rows])
+        )
+        extend_lease()
+        yield rows
+
+
+def _delete_comment_batch(user_id, batch_size):
+    comments = list(
+        Comment.objects.filter(author_id=user_id).values_list(
+            "pk", "post_id", "created"
+        )[:batch_size]
+    )
+    if not comments:
+        return 0
+    raw_delete(Comment.objects.filter(pk__in=[pk for pk, _, _ in comments]))
+    post_ids = {post_id for _, post_id, _ in comments}
+    bump_feed_versions(f"post:{post_id}" for post_id in post_ids)
+    for post_id in post_ids:
+        invalidate_comments(post_id)
+    buckets = {
+        (post_id, current_bucket(created.timestamp()))
+        for _, post_id, created in comments
+    }
+    for post_id, bucket in buckets:
+        enqueue("posts.update_trending", post_id=post_id, bucket=bucket)
+    return len(comments)
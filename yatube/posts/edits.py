@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import Post
+
+INITIAL_VERSION = 1
+
+
+class EditConflict(Exception):
+    """Пост изменили после того, как автор открыл форму."""
+
+
+def submitted_version(request):
+    """Версия из скрытого поля формы, от которой автор начинал правку.
+
+    Клиент без поля считается правившим исходную версию: если пост
+    с тех пор меняли, это конфликт, а не молчаливая перезапись.
+    Некорректное значение даёт None, то есть тоже конфликт.
+    """
+    version = request.POST.get("version", str(INITIAL_VERSION))
+    if not version.isdigit() or int(version) < INITIAL_VERSION:
+        return None
+    return int(version)
+
+
+def save_post_changes(post, fields, version):
+    """Сохраняет только fields, если версия поста в базе всё ещё version.
+
+    Версия сдвигается условным UPDATE, поэтому из двух одновременных
+    правок проходит одна, а вторая получает EditConflict. Неизменённые
+    поля, в том числе картинка, не записываются и не обрабатываются.
+    """
+    if version is None:
+        raise EditConflict
+    fields = [field for field in fields if field != "version"]
+    if not fields:
+        return False
+    with transaction.atomic():
+        updated = Post.objects.filter(pk=post.pk, version=version).update(
+            version=F("version") + 1
+        )
+        if not updated:
+            raise EditConflict
+        post.version = version + 1
+        post.save(update_fields=[*fields, "version"])
+    return True
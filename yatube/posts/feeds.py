@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .caches import get_feed_version, get_group_or_404
+from .models import Post, User
+
+FEED_CACHE_KEY = "posts:feed:{scope}:{version}:{feed_type}"
+
+
+class PostsFeed(Feed):
+    title = "Yatube: последние записи"
+    description = "Последние записи всех авторов"
+
+    def link(self):
+        return reverse("posts:index")
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        posts = self.get_posts(obj).select_related("author", "group")
+        return posts[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.text[:50]
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse("posts:post_detail", kwargs={"post_id": item.pk})
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class GroupPostsFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_group_or_404(slug)
+
+    def title(self, obj):
+        return f"Yatube: записи сообщества {obj.title}"
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse("posts:group", kwargs={"slug": obj.slug})
+
+    def get_posts(self, obj):
+        return obj.posts.all()
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f"Yatube: записи {obj.get_full_name() or obj.username}"
+
+    def description(self, obj):
+        return self.title(obj)
+
+    def link(self, obj):
+        return reverse("posts:profile", kwargs={"username": obj.username})
+
+    def get_posts(self, obj):
+        return obj.posts.all()
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomGroupPostsFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class AtomAuthorPostsFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.title(obj)
+
+
+def feed_scope(slug=None, username=None):
+    """Имя ленты, версия которой меняется при изменении её постов."""
+    if slug is not None:
+        return f"group:{get_group_or_404(slug).pk}"
+    if username is not None:
+        return f"author:{username}"
+    return "all"
+
+
+def cached_feed(feed):
+    """Оборачивает ленту в условный GET и кеш готового XML.
+
+    Пока в ленте нет новых постов, ответ 304 или закешированный XML
+    отдаются без запросов к базе.
+    """
+    feed_type = feed.feed_type.__name__
+
+    def etag(request, **kwargs):
+        scope = feed_scope(**kwargs)
+        return f"{scope}-{get_feed_version(scope)}-{feed_type}"
+
+    def last_modified(request, **kwargs):
+        version = get_feed_version(feed_scope(**kwargs))
+        return datetime.fromtimestamp(version, tz=timezone.utc)
+
+    @condition(etag_func=etag, last_modified_func=last_modified)
+    def view(request, **kwargs):
+        scope = feed_scope(**kwargs)
+        key = FEED_CACHE_KEY.format(
+            scope=scope,
+            version=get_feed_version(scope),
+            feed_type=feed_type,
+        )
+        cached = cache.get(key)
+        if cached is None:
+            response = feed(request, **kwargs)
+            cached = (response.content, response["Content-Type"])
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    return view
@@ -1,5 +1,8 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
 
+from .caches import get_group_choices
+from .images import ingest_image
 from .models import Comment, Post
 
 
@@ -17,6 +20,16 @@ class PostForm(forms.ModelForm):
             "group": "Необязательное поле",
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["group"].choices = get_group_choices()
+
+    def clean_image(self):
+        image = self.cleaned_data.get("image")
+        if isinstance(image, UploadedFile):
+            image = ingest_image(image)
+        return image
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,38 @@
+from core.holes import hole
+
+from .caches import get_following_ids
+from .forms import CommentForm
+from .recommendations import get_recommendations
+
+
+@hole("posts.switcher", "posts/includes/switcher.html")
+def switcher(request, view_name=""):
+    return {"view_name": view_name}
+
+
+@hole("posts.follow_button", "posts/includes/follow_button.html")
+def follow_button(request, username, author_id):
+    user = request.user
+    following = user.is_authenticated and (
+        author_id in get_following_ids(user)
+    )
+    return {"username": username, "following": following}
+
+
+@hole("posts.recommendations", "posts/includes/recommendations.html")
+def recommendations(request, exclude_id=None):
+    exclude = [exclude_id] if exclude_id is not None else []
+    return {"recommendations": get_recommendations(request.user, exclude)}
+
+
+@hole("posts.edit_link", "posts/includes/edit_link.html")
+def edit_link(request, post_id, author_id):
+    return {
+        "post_id": post_id,
+        "can_edit": request.user.pk == author_id,
+    }
+
+
+@hole("posts.comment_form", "posts/includes/comment_form.html")
+def comment_form(request, post_id):
+    return {"post_id": post_id, "form": CommentForm()}
@@ -0,0 +1,93 @@
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image, ImageOps, ImageSequence
+
+SAVE_OPTIONS = {
+    "JPEG": {"optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"method": 4},
+    "GIF": {},
+}
+
+
+def check_header(image):
+    """Проверяет формат и размеры по заголовку, не декодируя пиксели."""
+    if image.format not in settings.IMAGE_ALLOWED_FORMATS:
+        raise ValidationError(
+            f"Формат {image.format} не поддерживается", code="invalid_format"
+        )
+    width, height = image.size
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            "Слишком большое разрешение картинки", code="too_many_pixels"
+        )
+
+
+def ingest_image(upload):
+    """Готовит загруженную картинку к хранению.
+
+    Картинка уменьшается до IMAGE_MAX_SIZE, поворачивается по EXIF,
+    теряет метаданные и перекодируется с качеством IMAGE_QUALITY.
+    У анимаций так обрабатывается каждый кадр, кадров не больше
+    IMAGE_MAX_FRAMES.
+    """
+    if upload.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError("Слишком большой файл", code="too_large")
+    upload.seek(0)
+    try:
+        image = Image.open(upload)
+    except (Image.DecompressionBombError, OSError):
+        raise ValidationError("Не удалось прочитать картинку", code="invalid")
+    check_header(image)
+    image_format = image.format
+    options = {
+        "quality": settings.IMAGE_QUALITY,
+        **SAVE_OPTIONS.get(image_format, {}),
+    }
+    if getattr(image, "is_animated", False):
+        frames, animation = resize_frames(image)
+        image = frames[0]
+        options.update(animation, save_all=True, append_images=frames[1:])
+    else:
+        if image_format == "JPEG":
+            # Декодируем JPEG сразу в уменьшенном масштабе (1/2, 1/4, 1/8).
+            image.draft("RGB", settings.IMAGE_MAX_SIZE)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(settings.IMAGE_MAX_SIZE, Image.LANCZOS)
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+    output = BytesIO()
+    image.save(output, image_format, **options)
+    return SimpleUploadedFile(
+        upload.name,
+        output.getvalue(),
+        content_type=Image.MIME.get(image_format, upload.content_type),
+    )
+
+
+def resize_frames(image):
+    """Уменьшает кадры анимации; возвращает (кадры, параметры анимации).
+
+    Метаданные кадров отбрасываются и при сохранении не переносятся.
+    """
+    if image.n_frames > settings.IMAGE_MAX_FRAMES:
+        raise ValidationError(
+            "Слишком много кадров в анимации", code="too_many_frames"
+        )
+    frames = []
+    durations = []
+    for frame in ImageSequence.Iterator(image):
+        durations.append(frame.info.get("duration", 100))
+        resized = frame.convert("RGBA")
+        resized.info.clear()
+        resized.thumbnail(settings.IMAGE_MAX_SIZE, Image.LANCZOS)
+        frames.append(resized)
+    animation = {
+        "duration": durations,
+        "loop": image.info.get("loop", 0),
+        "disposal": 2,
+    }
+    return frames, animation
@@ -0,0 +1,91 @@
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from posts.models import Comment, Post, TrendingBucket, User
+from posts.trending import compact, current_bucket, trending_page
+
+
+def measure(func, iterations):
+    """Возвращает результат func и среднее время выполнения в мс."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / iterations
+
+
+def naive_page():
+    since = timezone.now() - timedelta(
+        seconds=settings.TRENDING_BUCKET_SECONDS
+        * settings.TRENDING_WINDOW_BUCKETS
+    )
+    return list(
+        Post.objects.annotate(
+            recent=Count("comments", filter=Q(comments__created__gte=since))
+        )
+        .filter(recent__gt=0)
+        .select_related("author", "group")
+        .order_by("-recent", "-pk")[:settings.POSTS_QUANTITY]
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает страницу рейтинга из таблицы очков с агрегирующим "
+        "запросом по комментариям. С --posts создаёт временные данные "
+        "и откатывает их после замера."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=0)
+        parser.add_argument("--comments", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["posts"]:
+                self.seed(options["posts"], options["comments"])
+            _, naive_ms = measure(naive_page, options["iterations"])
+            _, table_ms = measure(trending_page, options["iterations"])
+            transaction.set_rollback(True)
+        self.stdout.write(f"Агрегирующий запрос: {naive_ms:.2f} мс")
+        self.stdout.write(f"Таблица очков:       {table_ms:.2f} мс")
+
+    def seed(self, posts, comments):
+        author = User.objects.create(username="bench_trending")
+        Post.objects.bulk_create(
+            Post(author=author, text="bench") for _ in range(posts)
+        )
+        post_ids = list(author.posts.values_list("pk", flat=True))
+        Comment.objects.bulk_create(
+            Comment(author=author, post_id=random.choice(post_ids), text="c")
+            for _ in range(comments)
+        )
+        # bulk_create ставит created = now, поэтому разносим комментарии
+        # по часам окна отдельными UPDATE и сразу считаем бакеты.
+        now = timezone.now()
+        size = settings.TRENDING_BUCKET_SECONDS
+        by_age = {}
+        buckets = Counter()
+        for pk, post_id in author.comments.values_list("pk", "post_id"):
+            age = random.randrange(settings.TRENDING_WINDOW_BUCKETS)
+            by_age.setdefault(age, []).append(pk)
+            created = now - timedelta(seconds=age * size)
+            buckets[post_id, current_bucket(created.timestamp())] += 1
+        for age, pks in by_age.items():
+            Comment.objects.filter(pk__in=pks).update(
+                created=now - timedelta(seconds=age * size)
+            )
+        TrendingBucket.objects.bulk_create(
+            TrendingBucket(post_id=post_id, bucket=bucket, comments=count)
+            for (post_id, bucket), count in buckets.items()
+        )
+        compact()
+        self.stdout.write(f"Создано {posts} постов и {comments} комментариев")
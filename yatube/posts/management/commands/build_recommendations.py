@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.models import User
+from posts.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рекомендации авторов по графу подписок. "
+        "Запускать по расписанию."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=settings.RECOMMENDATIONS_TOP_K
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids = User.objects.filter(is_active=True).values_list(
+            "pk", flat=True
+        )
+        saved = build_recommendations(
+            user_ids.iterator(), options["top"], options["batch_size"]
+        )
+        self.stdout.write(f"Сохранено рекомендаций: {saved}")
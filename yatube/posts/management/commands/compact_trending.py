@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import compact
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет бакеты рейтинга вне окна и пересчитывает очки постов. "
+        "Запускать по расписанию, например раз в час."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        ranked = compact(options["batch_size"])
+        self.stdout.write(f"Постов в рейтинге: {ranked}")
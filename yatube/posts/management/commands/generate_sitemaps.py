@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Генерирует sitemap.xml и перезаписывает изменившиеся шарды."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default=settings.SITE_URL)
+        parser.add_argument(
+            "--shard-size", type=int, default=settings.SITEMAP_SHARD_SIZE
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перезаписать все шарды, даже не изменившиеся.",
+        )
+
+    def handle(self, *args, **options):
+        written = generate_sitemaps(
+            settings.SITEMAP_ROOT,
+            options["base_url"].rstrip("/"),
+            options["shard_size"],
+            force=options["force"],
+        )
+        for filename in written:
+            self.stdout.write(f"Записан {filename}")
+        self.stdout.write(f"Обновлено шардов: {len(written)}")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает GroupStats по таблице постов, например после "
+        "bulk_create или правки базы вручную."
+    )
+
+    def handle(self, *args, **options):
+        rebuild()
+        self.stdout.write("Статистика групп пересчитана")
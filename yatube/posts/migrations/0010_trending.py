@@ -0,0 +1,53 @@
+# Generated by Django 2.2.28 on 2026-10-19 19:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_image_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.IntegerField()),
+                ('comments', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='posts.Post')),
+                ('score', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['-score', '-post'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'created'], name='posts_comme_post_id_944a68_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['-score', '-post'], name='posts_trend_score_aceb70_idx'),
+        ),
+        migrations.AddField(
+            model_name='trendingbucket',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_buckets', to='posts.Post'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingbucket',
+            index=models.Index(fields=['bucket'], name='posts_trend_bucket_48605d_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='trendingbucket',
+            constraint=models.UniqueConstraint(fields=('post', 'bucket'), name='unique trending bucket'),
+        ),
+    ]
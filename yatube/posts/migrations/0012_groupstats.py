@@ -0,0 +1,43 @@
+# Generated by Django 2.2.28 on 2026-10-19 19:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model("posts", "Group")
+    GroupStats = apps.get_model("posts", "GroupStats")
+    Post = apps.get_model("posts", "Post")
+    for group in Group.objects.all().iterator():
+        posts = Post.objects.filter(group=group).order_by("-pub_date", "-pk")
+        latest = posts.first()
+        GroupStats.objects.create(
+            group=group,
+            post_count=posts.count(),
+            latest_post=latest,
+            latest_pub_date=latest.pub_date if latest else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('latest_pub_date', models.DateTimeField(blank=True, null=True)),
+                ('latest_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='groupstats',
+            index=models.Index(fields=['-latest_pub_date'], name='posts_group_latest__8e64c8_idx'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
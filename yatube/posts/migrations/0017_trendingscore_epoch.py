@@ -0,0 +1,30 @@
+# Generated by Django 2.2.28 on 2026-10-19 20:18
+
+import time
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_current_epoch(apps, schema_editor):
+    # Существующие очки посчитаны от опоры, действующей сейчас.
+    TrendingScore = apps.get_model("posts", "TrendingScore")
+    bucket = int(time.time()) // settings.TRENDING_BUCKET_SECONDS
+    period = settings.TRENDING_REBASE_BUCKETS
+    TrendingScore.objects.update(epoch=bucket // period * period)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_follow_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trendingscore',
+            name='epoch',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(set_current_epoch, migrations.RunPython.noop),
+    ]
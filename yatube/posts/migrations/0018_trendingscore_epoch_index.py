@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_trendingscore_epoch'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trendingscore',
+            name='epoch',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+    ]
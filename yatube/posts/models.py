@@ -26,10 +26,14 @@ class Post(models.Model):
         on_delete=models.SET_NULL,
         related_name="posts",
     )
-    image = models.ImageField("Картинка", upload_to="posts/", blank=True)
+    image = models.ImageField(
+        "Картинка", upload_to="posts/", blank=True, db_index=True
+    )
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     class Meta:
         ordering = ["-pub_date", "-pk"]
+        indexes = [models.Index(fields=["-pub_date", "-id"])]
 
     def __str__(self) -> str:
         return self.text[:15]
@@ -49,6 +53,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["post", "created"]),
+            models.Index(fields=["created"]),
+        ]
 
     def __str__(self) -> str:
         return self.text[:15]
@@ -68,3 +76,119 @@ class Follow(models.Model):
             models.UniqueConstraint(
                 fields=["user", "author"], name="unique follow")
         ]
+
+
+class ArchivedPost(models.Model):
+    """Пост, перенесённый из Post командой archive_posts. id сохраняется."""
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_posts"
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_posts",
+    )
+    image = models.ImageField(
+        "Картинка", upload_to="posts/", blank=True, db_index=True
+    )
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-pub_date", "-pk"]
+        indexes = [models.Index(fields=["author", "-pub_date"])]
+
+    def __str__(self) -> str:
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    created = models.DateTimeField()
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_comments"
+    )
+    post = models.ForeignKey(
+        ArchivedPost, on_delete=models.CASCADE, related_name="comments"
+    )
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return self.text[:15]
+
+
+class GroupStats(models.Model):
+    # post_count включает архивные посты: архивация его не меняет.
+    group = models.OneToOneField(
+        Group, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    latest_pub_date = models.DateTimeField(null=True, blank=True)
+    latest_post = models.ForeignKey(
+        Post,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["-latest_pub_date"])]
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="recommendations"
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="recommended_to"
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["user", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "author"], name="unique recommendation")
+        ]
+        indexes = [models.Index(fields=["user", "rank"])]
+
+
+class TrendingBucket(models.Model):
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="trending_buckets"
+    )
+    bucket = models.IntegerField()
+    comments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "bucket"], name="unique trending bucket")
+        ]
+        indexes = [models.Index(fields=["bucket"])]
+
+
+class TrendingScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trending_score",
+    )
+    score = models.FloatField(default=0)
+    # Опорный бакет, от которого посчитаны очки (см. trending.epoch_bucket).
+    epoch = models.IntegerField(default=0, db_index=True)
+
+    class Meta:
+        ordering = ["-score", "-post"]
+        indexes = [models.Index(fields=["-score", "-post"])]
@@ -0,0 +1,110 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .caches import get_following_ids
+from .models import Follow, Recommendation
+
+
+def load_graph():
+    """Списки смежности подписок: кто на кого подписан и наоборот."""
+    following = defaultdict(set)
+    followers = defaultdict(set)
+    pairs = Follow.objects.values_list("user_id", "author_id").iterator()
+    for user_id, author_id in pairs:
+        following[user_id].add(author_id)
+        followers[author_id].add(user_id)
+    return following, followers
+
+
+def recommend(user_id, following, followers, top_k):
+    """Возвращает до top_k пар (score, author_id) для пользователя.
+
+    Кандидаты набирают очки двумя путями: авторы, на которых подписаны
+    авторы пользователя (второй круг), и авторы, на которых подписаны
+    похожие читатели. Похожесть читателей — косинусная мера по общим
+    подпискам.
+    """
+    own = following.get(user_id, set())
+    scores = Counter()
+    overlap = Counter()
+    limit = settings.RECOMMENDATIONS_MAX_FOLLOWERS
+    for author_id in own:
+        for candidate in following.get(author_id, ()):
+            scores[candidate] += settings.RECOMMENDATIONS_SECOND_DEGREE_WEIGHT
+        readers = followers[author_id]
+        if len(readers) > limit:
+            # Популярный автор почти ничего не говорит о вкусах читателя.
+            continue
+        for reader in readers:
+            overlap[reader] += 1
+    overlap.pop(user_id, None)
+    for reader, common in overlap.items():
+        similarity = common / math.sqrt(len(own) * len(following[reader]))
+        for candidate in following[reader]:
+            scores[candidate] += similarity
+    for excluded in own | {user_id}:
+        scores.pop(excluded, None)
+    return heapq.nlargest(
+        top_k, ((score, author) for author, score in scores.items())
+    )
+
+
+def popular_authors(followers, top_k):
+    return heapq.nlargest(
+        top_k,
+        ((len(users), author) for author, users in followers.items()),
+    )
+
+
+def build_recommendations(user_ids, top_k, batch_size=1000):
+    """Пересчитывает сохранённые списки рекомендаций для user_ids.
+
+    Тем, у кого нет подписок, предлагаются самые популярные авторы.
+    Возвращает число сохранённых рекомендаций.
+    """
+    following, followers = load_graph()
+    fallback = popular_authors(followers, top_k + 1)
+    user_ids = list(user_ids)
+    saved = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        rows = []
+        for user_id in batch:
+            ranked = recommend(user_id, following, followers, top_k)
+            if not ranked:
+                ranked = [
+                    (score, author)
+                    for score, author in fallback
+                    if author != user_id
+                ][:top_k]
+            rows.extend(
+                Recommendation(
+                    user_id=user_id, author_id=author, score=score, rank=rank
+                )
+                for rank, (score, author) in enumerate(ranked)
+            )
+        with transaction.atomic():
+            Recommendation.objects.filter(user_id__in=batch).delete()
+            saved += len(Recommendation.objects.bulk_create(rows))
+    return saved
+
+
+def get_recommendations(user, exclude=()):
+    """Готовые рекомендации без авторов, на которых уже подписались.
+
+    exclude — id авторов, которых не нужно показывать.
+    """
+    if not user.is_authenticated:
+        return []
+    skip = get_following_ids(user) | set(exclude)
+    rows = (
+        Recommendation.objects.filter(user=user)
+        .select_related("author")
+        .order_by("rank")[:settings.RECOMMENDATIONS_TOP_K]
+    )
+    authors = [row.author for row in rows if row.author_id not in skip]
+    return authors[:settings.RECOMMENDATIONS_SHOWN]
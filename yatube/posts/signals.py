@@ -0,0 +1,112 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.jobs import enqueue
+
+from . import stats, tasks  # noqa: F401
+from .caches import (
+    bump_feed_versions,
+    invalidate_comments,
+    invalidate_following,
+    invalidate_groups,
+)
+from .models import Comment, Follow, Group, GroupStats, Post
+from .trending import current_bucket
+
+# Поля, которые видны в лентах; остальные касаются только страницы поста.
+LISTED_FIELDS = {"text", "group", "image"}
+
+
+@receiver([post_save, post_delete], sender=Group)
+def group_changed(sender, **kwargs):
+    invalidate_groups()
+    bump_feed_versions(["groups"])
+
+
+@receiver(post_save, sender=Group)
+def create_group_stats(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+
+
+@receiver([post_save, post_delete], sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    # Кеш процесса-воркера не общий с веб-процессами, поэтому
+    # инвалидация выполняется здесь, а не задачей.
+    invalidate_following(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_comments(instance.post_id)
+    bump_feed_versions([f"post:{instance.post_id}"])
+    enqueue(
+        "posts.update_trending",
+        post_id=instance.post_id,
+        bucket=current_bucket(instance.created.timestamp()),
+    )
+
+
+@receiver(post_init, sender=Post)
+def remember_original(sender, instance, **kwargs):
+    # Читаем __dict__, чтобы не загружать отложенные поля.
+    image = instance.__dict__.get("image")
+    instance._original_image = getattr(image, "name", image)
+    instance._original_group_id = instance.__dict__.get("group_id")
+
+
+@receiver(post_save, sender=Post)
+def image_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    original = instance._original_image
+    if original == instance.image.name:
+        return
+    if original:
+        enqueue("posts.release_image", image_name=original)
+    if instance.image:
+        enqueue("posts.generate_image_variants", post_id=instance.pk)
+    instance._original_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image.name:
+        enqueue(
+            "posts.release_image", image_name=instance.image.name
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # Должен выполняться до post_changed, который обновляет
+    # _original_group_id.
+    if update_fields is not None and "group" not in update_fields:
+        return
+    original = None if created else instance._original_group_id
+    if original == instance.group_id:
+        return
+    if original is not None:
+        stats.post_removed(original, instance.pk)
+    if instance.group_id is not None:
+        stats.post_added(instance.group_id, instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_group_stats(sender, instance, **kwargs):
+    if instance.group_id is not None:
+        stats.post_removed(instance.group_id, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_changed(sender, instance, update_fields=None, **kwargs):
+    scopes = {f"post:{instance.pk}"}
+    if update_fields is None or LISTED_FIELDS & update_fields:
+        scopes.update(("all", f"author:{instance.author.username}"))
+        for group_id in (instance._original_group_id, instance.group_id):
+            if group_id is not None:
+                scopes.add(f"group:{group_id}")
+    bump_feed_versions(scopes)
+    instance._original_group_id = instance.group_id
@@ -0,0 +1,183 @@
+import json
+import os
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, Max, Sum
+from django.urls import reverse
+
+from .models import Group, Post, User
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+MANIFEST_NAME = "manifest.json"
+
+
+class ShardedSitemap:
+    """Карта сайта, разбитая на файлы по диапазонам первичного ключа.
+
+    Шард n содержит объекты с pk из [n * shard_size + 1, (n + 1) * shard_size],
+    поэтому в нём не больше shard_size ссылок, а границы шардов не сдвигаются
+    при добавлении и удалении объектов. Каждый шард читается одним
+    диапазонным запросом по индексу pk, без OFFSET.
+    """
+
+    name = None
+    queryset = None
+
+    def __init__(self, shard_size):
+        self.shard_size = shard_size
+
+    def shard_count(self):
+        last = self.queryset.aggregate(last=Max("pk"))["last"]
+        return 0 if last is None else (last - 1) // self.shard_size + 1
+
+    def shard_range(self, shard):
+        return shard * self.shard_size + 1, (shard + 1) * self.shard_size
+
+    def shard_queryset(self, shard):
+        low, high = self.shard_range(shard)
+        return self.queryset.filter(pk__gte=low, pk__lte=high)
+
+    def fingerprint(self, shard):
+        """Отпечаток шарда: меняется при добавлении или удалении объектов."""
+        stats = self.shard_queryset(shard).aggregate(
+            count=Count("pk"), total=Sum("pk"), last=Max("pk")
+        )
+        return [stats["count"], stats["total"], stats["last"]]
+
+    def urls(self, shard):
+        """Возвращает пары (путь, lastmod) по возрастанию pk."""
+        raise NotImplementedError
+
+
+class PostSitemap(ShardedSitemap):
+    name = "posts"
+    queryset = Post.objects.all()
+
+    def urls(self, shard):
+        posts = (
+            self.shard_queryset(shard)
+            .order_by("pk")
+            .values_list("pk", "pub_date")
+        )
+        for pk, pub_date in posts.iterator():
+            yield reverse("posts:post_detail", args=[pk]), pub_date
+
+
+class ProfileSitemap(ShardedSitemap):
+    name = "profiles"
+    queryset = User.objects.filter(posts__isnull=False).distinct()
+
+    def fingerprint(self, shard):
+        low, high = self.shard_range(shard)
+        posts = Post.objects.filter(author_id__gte=low, author_id__lte=high)
+        stats = posts.aggregate(
+            count=Count("pk"), total=Sum("pk"), last=Max("pk")
+        )
+        return [stats["count"], stats["total"], stats["last"]]
+
+    def urls(self, shard):
+        users = (
+            self.shard_queryset(shard)
+            .annotate(lastmod=Max("posts__pub_date"))
+            .order_by("pk")
+            .values_list("username", "lastmod")
+        )
+        for username, lastmod in users.iterator():
+            yield reverse("posts:profile", args=[username]), lastmod
+
+
+class GroupSitemap(ShardedSitemap):
+    name = "groups"
+    queryset = Group.objects.all()
+
+    def fingerprint(self, shard):
+        groups = self.shard_queryset(shard).annotate(
+            lastmod=Max("posts__pub_date")
+        )
+        return [
+            [slug, lastmod.isoformat() if lastmod else None]
+            for slug, lastmod in groups.order_by("pk").values_list(
+                "slug", "lastmod"
+            )
+        ]
+
+    def urls(self, shard):
+        groups = (
+            self.shard_queryset(shard)
+            .annotate(lastmod=Max("posts__pub_date"))
+            .order_by("pk")
+            .values_list("slug", "lastmod")
+        )
+        for slug, lastmod in groups.iterator():
+            yield reverse("posts:group", args=[slug]), lastmod
+
+
+SITEMAPS = (PostSitemap, ProfileSitemap, GroupSitemap)
+
+
+def shard_filename(sitemap, shard):
+    return f"sitemap-{sitemap.name}-{shard}.xml"
+
+
+def write_atomic(path, lines):
+    """Пишет файл построчно во временный файл и подменяет им старый."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        for line in lines:
+            file.write(line)
+    os.replace(tmp_path, path)
+
+
+def shard_lines(sitemap, shard, base_url):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for path, lastmod in sitemap.urls(shard):
+        yield f"<url><loc>{escape(base_url + path)}</loc>"
+        if lastmod is not None:
+            yield f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+        yield "</url>\n"
+    yield "</urlset>\n"
+
+
+def index_lines(filenames, base_url):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for filename in filenames:
+        location = escape(f"{base_url}/{filename}")
+        yield f"<sitemap><loc>{location}</loc></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def generate_sitemaps(root, base_url, shard_size, force=False):
+    """Перегенерирует изменившиеся шарды и индекс sitemap.xml.
+
+    Возвращает список имён перезаписанных файлов шардов.
+    """
+    os.makedirs(root, exist_ok=True)
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    new_manifest = {}
+    written = []
+    for sitemap_class in SITEMAPS:
+        sitemap = sitemap_class(shard_size)
+        for shard in range(sitemap.shard_count()):
+            filename = shard_filename(sitemap, shard)
+            fingerprint = sitemap.fingerprint(shard)
+            new_manifest[filename] = fingerprint
+            path = os.path.join(root, filename)
+            if manifest.get(filename) == fingerprint and os.path.exists(path):
+                continue
+            write_atomic(path, shard_lines(sitemap, shard, base_url))
+            written.append(filename)
+    for filename in set(manifest) - set(new_manifest):
+        path = os.path.join(root, filename)
+        if os.path.exists(path):
+            os.remove(path)
+    write_atomic(
+        os.path.join(root, "sitemap.xml"), index_lines(new_manifest, base_url)
+    )
+    write_atomic(manifest_path, [json.dumps(new_manifest)])
+    return written
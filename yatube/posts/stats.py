@@ -0,0 +1,64 @@
+from django.db.models import F, Q
+
+from .models import ArchivedPost, Group, GroupStats, Post
+
+
+def post_added(group_id, post):
+    GroupStats.objects.get_or_create(group_id=group_id)
+    stats = GroupStats.objects.filter(group_id=group_id)
+    stats.update(post_count=F("post_count") + 1)
+    stats.filter(
+        Q(latest_pub_date__isnull=True)
+        | Q(latest_pub_date__lt=post.pub_date)
+        | Q(latest_pub_date=post.pub_date, latest_post_id__lt=post.pk)
+    ).update(latest_pub_date=post.pub_date, latest_post_id=post.pk)
+
+
+def posts_added(group_id, count):
+    """Учитывает пачку постов, созданных bulk_create без сигналов."""
+    GroupStats.objects.get_or_create(group_id=group_id)
+    GroupStats.objects.filter(group_id=group_id).update(
+        post_count=F("post_count") + count
+    )
+    refresh_latest(group_id)
+
+
+def post_removed(group_id, post_id):
+    stats = GroupStats.objects.filter(group_id=group_id)
+    stats.filter(post_count__gt=0).update(post_count=F("post_count") - 1)
+    # При удалении поста SET_NULL успевает обнулить latest_post.
+    if stats.filter(
+        Q(latest_post_id=post_id) | Q(latest_post__isnull=True)
+    ).exists():
+        refresh_latest(group_id, exclude_id=post_id)
+
+
+def refresh_latest(group_id, exclude_id=None):
+    latest = (
+        Post.objects.filter(group_id=group_id)
+        .exclude(pk=exclude_id)
+        .values_list("pk", "pub_date")
+        .first()
+    )
+    post_id, pub_date = latest or (None, None)
+    GroupStats.objects.filter(group_id=group_id).update(
+        latest_post_id=post_id, latest_pub_date=pub_date
+    )
+
+
+def rebuild(group_ids=None):
+    """Пересчитывает статистику групп по постам и архиву."""
+    groups = Group.objects.all()
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+    for group_id in groups.values_list("pk", flat=True).iterator():
+        GroupStats.objects.update_or_create(
+            group_id=group_id,
+            defaults={
+                "post_count": (
+                    Post.objects.filter(group_id=group_id).count()
+                    + ArchivedPost.objects.filter(group_id=group_id).count()
+                )
+            },
+        )
+        refresh_latest(group_id)
@@ -0,0 +1,83 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from sorl.thumbnail import delete
+
+from core.images import image_variants
+from core.jobs import enqueue, job
+
+from . import deletion
+from .models import ArchivedPost, Post
+from .trending import update_post
+
+
+@job("posts.update_trending")
+def update_trending(post_id, bucket):
+    update_post(post_id, bucket)
+
+
+@job("posts.release_image")
+def release_image(image_name):
+    """Удаляет файл и его миниатюры, если на него не ссылается ни один пост.
+
+    Файл, который недавно загрузили повторно, мог достаться посту из ещё
+    не зафиксированной транзакции, поэтому его удаление откладывается.
+    """
+    if (
+        Post.objects.filter(image=image_name).exists()
+        or ArchivedPost.objects.filter(image=image_name).exists()
+    ):
+        return
+    try:
+        age = time.time() - default_storage.get_modified_time(
+            image_name
+        ).timestamp()
+    except (OSError, SuspiciousFileOperation):
+        age = None
+    if age is not None and age < settings.IMAGE_RELEASE_GRACE:
+        enqueue(
+            "posts.release_image",
+            delay=settings.IMAGE_RELEASE_GRACE - age,
+            image_name=image_name,
+        )
+        return
+    try:
+        delete(image_name)
+    except SuspiciousFileOperation:
+        # Путь вне MEDIA_ROOT: файл не принадлежит хранилищу.
+        pass
+
+
+@job("posts.generate_image_variants")
+def generate_image_variants(post_id):
+    post = Post.objects.filter(pk=post_id).only("image").first()
+    if post is not None and post.image:
+        image_variants(post.image, settings.RESPONSIVE_IMAGE_GEOMETRY)
+
+
+@job("posts.generate_batch_image_variants")
+def generate_batch_image_variants(post_ids):
+    """Варианты картинок для пачки постов; общий файл — один раз."""
+    images = (
+        Post.objects.filter(pk__in=post_ids)
+        .exclude(image="")
+        .order_by()
+        .values_list("image", flat=True)
+        .distinct()
+    )
+    for name in images:
+        image_variants(
+            Post(image=name).image, settings.RESPONSIVE_IMAGE_GEOMETRY
+        )
+
+
+@job("posts.delete_posts", atomic=False)
+def delete_posts(post_ids):
+    deletion.delete_posts(post_ids)
+
+
+@job("posts.delete_user", atomic=False)
+def delete_user(user_id):
+    deletion.delete_user(user_id)
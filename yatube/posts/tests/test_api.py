@@ -0,0 +1,178 @@
+import base64
+import json
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.jobs import run_pending
+from core.models import Job
+from core.tests.utils import run_on_commit
+
+from ..caches import get_feed_versions
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b"\x47\x49\x46\x38\x39\x61\x02\x00"
+    b"\x01\x00\x80\x00\x00\x00\x00\x00"
+    b"\xFF\xFF\xFF\x21\xF9\x04\x00\x00"
+    b"\x00\x00\x00\x2C\x00\x00\x00\x00"
+    b"\x02\x00\x01\x00\x00\x02\x02\x0C"
+    b"\x0A\x00\x00"
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostBatchApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username="HasNoName", password="secret-pass"
+        )
+        cls.group = Group.objects.create(
+            title="Тестовая группа", slug="test-slug", description="-"
+        )
+        cls.url = reverse("posts:post_batch")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def post(self, data, password="secret-pass"):
+        credentials = base64.b64encode(
+            f"{self.user.username}:{password}".encode()
+        ).decode()
+        return self.client.post(
+            self.url,
+            json.dumps(data),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Basic {credentials}",
+        )
+
+    def test_requires_basic_auth(self):
+        response = self.client.post(
+            self.url, json.dumps({"posts": [{"text": "Пост"}]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
+        response = self.post({"posts": [{"text": "Пост"}]}, password="bad")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Post.objects.exists())
+
+    def test_invalid_batch_creates_nothing(self):
+        response = self.post(
+            {
+                "posts": [
+                    {"text": "Хороший пост"},
+                    {"text": " ", "group": "missing"},
+                    {"text": "Пост", "image": "posts/ab/../secret.txt"},
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(set(errors), {"1", "2"})
+        self.assertEqual(set(errors["1"]), {"text", "group"})
+        self.assertIn("image", errors["2"])
+        self.assertFalse(Post.objects.exists())
+
+    def test_non_string_group_is_a_field_error(self):
+        response = self.post(
+            {
+                "posts": [
+                    {"text": "Пост", "group": [self.group.slug]},
+                    {"text": "Пост", "group": {"slug": self.group.slug}},
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors["0"], {"group": ["Ожидается slug группы"]})
+        self.assertIn("group", errors["1"])
+        self.assertFalse(Post.objects.exists())
+
+    def test_batch_size_is_limited(self):
+        with self.settings(POST_BATCH_MAX_SIZE=2):
+            response = self.post({"posts": [{"text": "Пост"}] * 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_batch_created_with_fan_out_once(self):
+        versions = get_feed_versions(
+            "all", f"author:{self.user.username}", f"group:{self.group.pk}"
+        )
+        response = self.post(
+            {
+                "posts": [
+                    {"text": "Первый", "group": self.group.slug},
+                    {"text": "Второй", "group": self.group.slug},
+                    {"text": "Без группы"},
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 3)
+        self.assertEqual(
+            response.json()["ids"],
+            list(
+                Post.objects.filter(author=self.user)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+        )
+        self.assertEqual(
+            Post.objects.filter(author=self.user).count(), 3
+        )
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(
+            stats.latest_post_id,
+            Post.objects.filter(group=self.group).latest("pub_date", "pk").pk,
+        )
+        self.assertNotEqual(
+            get_feed_versions(
+                "all",
+                f"author:{self.user.username}",
+                f"group:{self.group.pk}",
+            ),
+            versions,
+        )
+
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_image_variants_enqueued_once_per_batch(self):
+        image = default_storage.save(
+            "posts/small.gif",
+            SimpleUploadedFile("small.gif", SMALL_GIF, "image/gif"),
+        )
+        with run_on_commit():
+            response = self.post(
+                {
+                    "posts": [
+                        {"text": "С картинкой", "image": image},
+                        {"text": "Без картинки"},
+                        {"text": "Та же картинка", "image": image},
+                    ]
+                }
+            )
+        self.assertEqual(response.status_code, 201)
+        first, _, third = response.json()["ids"]
+        job = Job.objects.get()
+        self.assertEqual(job.name, "posts.generate_batch_image_variants")
+        self.assertEqual(json.loads(job.payload), {"post_ids": [first, third]})
+        run_pending()
+        self.assertFalse(Job.objects.exists())
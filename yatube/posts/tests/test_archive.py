@@ -0,0 +1,125 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import ChainedPosts, archive_batch
+from ..models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Group,
+    GroupStats,
+    Post,
+)
+
+User = get_user_model()
+
+
+@override_settings(POSTS_QUANTITY=2)
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.group = Group.objects.create(
+            title="Тестовая группа", slug="test-slug", description="-"
+        )
+
+    def setUp(self):
+        cache.clear()
+        old = timezone.now() - timedelta(days=1000)
+        self.old_posts = [
+            Post.objects.create(
+                author=self.user, text=f"Старый {i}", group=self.group
+            )
+            for i in range(3)
+        ]
+        Post.objects.filter(pk__in=[p.pk for p in self.old_posts]).update(
+            pub_date=old
+        )
+        Comment.objects.create(
+            author=self.user, post=self.old_posts[0], text="Старый ответ"
+        )
+        self.new_post = Post.objects.create(author=self.user, text="Новый")
+
+    def test_archive_moves_old_posts_in_batches(self):
+        cutoff = timezone.now() - timedelta(days=365)
+        self.assertEqual(archive_batch(cutoff, 2), 2)
+        self.assertEqual(ArchivedPost.objects.count(), 2)
+        out = StringIO()
+        call_command("archive_posts", "--batch-size=2", stdout=out)
+        self.assertIn("Перенесено постов: 1", out.getvalue())
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(
+            ArchivedComment.objects.get().post_id, self.old_posts[0].pk
+        )
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertIsNone(stats.latest_post_id)
+
+    def test_archived_post_is_readable(self):
+        call_command("archive_posts", stdout=StringIO())
+        response = self.client.get(
+            reverse("posts:post_detail", args=[self.old_posts[0].pk])
+        )
+        self.assertContains(response, "Старый 0")
+        self.assertContains(response, "Старый ответ")
+        self.assertEqual(response.context["posts_count"], 4)
+
+    def test_profile_shows_archived_posts_after_hot_ones(self):
+        call_command("archive_posts", stdout=StringIO())
+        url = reverse("posts:profile", args=[self.user.username])
+        first = self.client.get(url).context["page_obj"]
+        self.assertEqual(first.paginator.count, 4)
+        self.assertEqual(first[0], self.new_post)
+        second = self.client.get(url, {"page": 2}).context["page_obj"]
+        self.assertEqual(
+            [post.pk for post in second],
+            [self.old_posts[1].pk, self.old_posts[0].pk],
+        )
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=0)
+    def test_group_pages_over_hot_and_archived_posts(self):
+        call_command("archive_posts", stdout=StringIO())
+        url = reverse("posts:group", args=[self.group.slug])
+        first = self.client.get(url).context["page_obj"]
+        self.assertEqual(first.paginator.count, 3)
+        last = self.client.get(
+            url, {"page": first.paginator.num_pages}
+        ).context["page_obj"]
+        self.assertEqual([post.pk for post in last], [self.old_posts[0].pk])
+        shown = [post.pk for post in first] + [post.pk for post in last]
+        self.assertEqual(
+            sorted(shown), sorted(post.pk for post in self.old_posts)
+        )
+
+    def test_chained_posts_count_hot_part_only_past_its_tail(self):
+        call_command("archive_posts", stdout=StringIO())
+        Post.objects.create(author=self.user, text="Ещё один")
+        posts = ChainedPosts(
+            Post.objects.order_by("pk"), ArchivedPost.objects.order_by("pk")
+        )
+        with CaptureQueriesContext(connection) as queries:
+            pages = [posts[0:1], posts[1:3]]
+        self.assertFalse(
+            [query for query in queries if "COUNT(" in query["sql"]]
+        )
+        posts = ChainedPosts(
+            Post.objects.order_by("pk"), ArchivedPost.objects.order_by("pk")
+        )
+        with CaptureQueriesContext(connection) as queries:
+            pages.append(posts[3:5])
+        self.assertEqual(
+            len([query for query in queries if "COUNT(" in query["sql"]]), 1
+        )
+        shown = [post.pk for page in pages for post in page]
+        self.assertEqual(len(shown), 5)
+        self.assertEqual(len(set(shown)), 5)
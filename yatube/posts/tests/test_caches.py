@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..caches import (
+    get_comments,
+    get_group_choices,
+    get_group_or_404,
+    get_groups,
+    is_following,
+)
+from ..forms import PostForm
+from ..models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class GroupRegistryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="test-slug",
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_groups_are_served_from_cache(self):
+        get_groups()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group_or_404("test-slug"), self.group)
+            self.assertEqual(get_groups(), [self.group])
+            PostForm().fields["group"].widget.render("group", None)
+
+    def test_group_save_invalidates_cache(self):
+        get_groups()
+        group = Group.objects.create(
+            title="Новая группа",
+            slug="new-slug",
+            description="Описание",
+        )
+        self.assertIn((group.pk, group.title), get_group_choices())
+        group.delete()
+        self.assertNotIn(group, get_groups())
+
+
+class FollowingCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.authors = [
+            User.objects.create_user(username=f"author_{i}")
+            for i in range(3)
+        ]
+        Follow.objects.create(user=cls.user, author=cls.authors[0])
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(FollowingCacheTests.user)
+
+    def test_is_following_batch_costs_one_query(self):
+        with self.assertNumQueries(1):
+            following = is_following(self.user, self.authors)
+        self.assertEqual(
+            following,
+            {
+                self.authors[0].pk: True,
+                self.authors[1].pk: False,
+                self.authors[2].pk: False,
+            },
+        )
+        with self.assertNumQueries(0):
+            is_following(self.user, self.authors)
+
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_follow_and_unfollow_invalidate_cache(self):
+        author = self.authors[1]
+        is_following(self.user, [author])
+        self.authorized_client.get(
+            reverse("posts:profile_follow", kwargs={"username": author})
+        )
+        self.assertTrue(is_following(self.user, [author])[author.pk])
+        self.authorized_client.get(
+            reverse("posts:profile_unfollow", kwargs={"username": author})
+        )
+        self.assertFalse(is_following(self.user, [author])[author.pk])
+
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_comment_invalidates_comments_without_worker(self):
+        post = Post.objects.create(author=self.authors[0], text="Пост")
+        self.assertEqual(get_comments(post.pk), [])
+        self.authorized_client.post(
+            reverse("posts:add_comment", kwargs={"post_id": post.pk}),
+            {"text": "Комментарий"},
+        )
+        self.assertEqual(
+            [comment.text for comment in get_comments(post.pk)],
+            ["Комментарий"],
+        )
+        self.assertTrue(Comment.objects.filter(post=post).exists())
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.tests.utils import run_on_commit
+
+from ..caches import get_following_ids
+from ..deletion import delete_posts, delete_user
+from ..models import (
+    Comment,
+    Follow,
+    Group,
+    GroupStats,
+    Post,
+    Recommendation,
+)
+
+User = get_user_model()
+
+
+@override_settings(JOBS_ALWAYS_EAGER=True, DELETION_BATCH_SIZE=2)
+class DeletionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title="Тестовая группа", slug="test-slug", description="-"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="prolific")
+        self.reader = User.objects.create_user(username="reader")
+        self.kept = Post.objects.create(
+            author=self.reader, text="Остаётся", group=self.group
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.user, text=f"Пост {i}", group=self.group
+            )
+            for i in range(5)
+        ]
+        Comment.objects.create(author=self.user, post=self.kept, text="Ок")
+        Comment.objects.create(
+            author=self.reader, post=self.posts[0], text="Ок"
+        )
+        Follow.objects.create(user=self.reader, author=self.user)
+
+    def test_delete_user_removes_dependents_in_batches(self):
+        self.assertEqual(get_following_ids(self.reader), {self.user.pk})
+        delete_user(self.user.pk)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(list(Post.objects.all()), [self.kept])
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(get_following_ids(self.reader), frozenset())
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 1)
+        self.assertEqual(stats.latest_post_id, self.kept.pk)
+
+    def test_delete_user_batches_follows_and_recommendations(self):
+        followers = [
+            User.objects.create_user(username=f"follower_{i}")
+            for i in range(3)
+        ]
+        for follower in followers:
+            Follow.objects.create(user=follower, author=self.user)
+            Recommendation.objects.create(
+                user=follower, author=self.user, score=1, rank=0
+            )
+            self.assertEqual(get_following_ids(follower), {self.user.pk})
+        with CaptureQueriesContext(connection) as queries:
+            delete_user(self.user.pk)
+        deletes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(
+                ('DELETE FROM "posts_follow"',
+                 'DELETE FROM "posts_recommendation"')
+            )
+            and '"id" IN' in query["sql"]
+        ]
+        # 4 подписки и 3 рекомендации пачками по 2.
+        self.assertEqual(len(deletes), 4)
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(Recommendation.objects.exists())
+        for follower in followers:
+            self.assertEqual(get_following_ids(follower), frozenset())
+
+    def test_delete_posts_fixes_group_stats(self):
+        delete_posts([post.pk for post in self.posts[2:]])
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 3)
+        self.assertEqual(stats.latest_post_id, self.posts[1].pk)
+
+    def test_admin_action_deletes_user_in_background(self):
+        admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "password"
+        )
+        client = Client()
+        client.force_login(admin)
+        with run_on_commit():
+            response = client.post(
+                reverse("admin:auth_user_changelist"),
+                {
+                    "action": "delete_in_background",
+                    "_selected_action": [self.user.pk],
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="test-slug",
+            description="Тестовое описание",
+        )
+        cls.post = Post.objects.create(
+            text="Пост в группе", author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_contain_posts(self):
+        urls = [
+            reverse("posts:feed_rss"),
+            reverse("posts:feed_atom"),
+            reverse("posts:group_feed_rss", kwargs={"slug": "test-slug"}),
+            reverse(
+                "posts:profile_feed_atom", kwargs={"username": self.user}
+            ),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Пост в группе", response.content.decode())
+
+    def test_unchanged_feed_costs_no_queries(self):
+        url = reverse("posts:group_feed_rss", kwargs={"slug": "test-slug"})
+        response = self.client.get(url)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).content, response.content)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_new_post_invalidates_its_scopes_only(self):
+        group_url = reverse(
+            "posts:group_feed_rss", kwargs={"slug": "test-slug"}
+        )
+        author = User.objects.create_user(username="Other")
+        author_url = reverse(
+            "posts:profile_feed_rss", kwargs={"username": author}
+        )
+        group_etag = self.client.get(group_url)["ETag"]
+        author_etag = self.client.get(author_url)["ETag"]
+        Post.objects.create(text="Новый пост", author=self.user)
+        self.assertEqual(
+            self.client.get(group_url, HTTP_IF_NONE_MATCH=group_etag)
+            .status_code,
+            304,
+        )
+        Post.objects.create(text="Пост Other", author=author)
+        response = self.client.get(author_url, HTTP_IF_NONE_MATCH=author_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Пост Other", response.content.decode())
@@ -3,8 +3,11 @@ import tempfile
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from ..models import Comment, Group, Post
@@ -85,8 +88,8 @@ class PostsFormsTests(TestCase):
         self.assertEqual(Post.objects.count(), posts_count + 1)
         self.assertEqual(latest_post.text, form_data["text"])
         self.assertEqual(latest_post.group.pk, form_data["group"])
-        self.assertEqual(latest_post.image.name,
-                         f'posts/{form_data["image"].name}')
+        self.assertRegex(latest_post.image.name,
+                         r"^posts/[0-9a-f]{2}/[0-9a-f]{64}\.gif$")
 
     def test_form_post_edit(self):
         post_id = PostsFormsTests.post.pk
@@ -127,8 +130,69 @@ class PostsFormsTests(TestCase):
             post_edited.group.pk,
             form_data_edited["group"],
         )
-        self.assertEqual(post_edited.image.name,
-                         f'posts/{form_data_edited["image"].name}')
+        self.assertRegex(post_edited.image.name,
+                         r"^posts/[0-9a-f]{2}/[0-9a-f]{64}\.gif$")
+
+    def test_form_post_edit_detects_conflict(self):
+        post = PostsFormsTests.post
+        url = reverse("posts:post_edit", kwargs={"post_id": post.pk})
+        form_data = {
+            "text": "Первая правка",
+            "group": post.group_id,
+            "version": post.version,
+        }
+        self.authorized_client.post(url, data=form_data)
+        self.assertEqual(Post.objects.get(pk=post.pk).version, 2)
+        cache.clear()
+        response = self.authorized_client.post(
+            url, data={**form_data, "text": "Устаревшая правка"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["conflict"])
+        self.assertEqual(response.context["version"], 2)
+        self.assertEqual(
+            response.context["form"]["text"].value(), "Первая правка"
+        )
+        self.assertContains(response, "Первая правка")
+        self.assertEqual(Post.objects.get(pk=post.pk).text, "Первая правка")
+
+    def test_form_post_edit_without_valid_version_is_a_conflict(self):
+        post = PostsFormsTests.post
+        url = reverse("posts:post_edit", kwargs={"post_id": post.pk})
+        form_data = {"text": "Первая правка", "group": post.group_id}
+        response = self.authorized_client.post(
+            url, data={**form_data, "version": "abc"}
+        )
+        self.assertTrue(response.context["conflict"])
+        # Без поля версии правка считается сделанной от исходной версии.
+        self.authorized_client.post(url, data=form_data)
+        self.assertEqual(Post.objects.get(pk=post.pk).version, 2)
+        cache.clear()
+        response = self.authorized_client.post(
+            url, data={**form_data, "text": "Вслепую"}
+        )
+        self.assertTrue(response.context["conflict"])
+        self.assertEqual(Post.objects.get(pk=post.pk).text, "Первая правка")
+
+    def test_form_post_edit_saves_only_changed_fields(self):
+        post = PostsFormsTests.post
+        with CaptureQueriesContext(connection) as queries:
+            self.authorized_client.post(
+                reverse("posts:post_edit", kwargs={"post_id": post.pk}),
+                data={"text": "Только текст", "group": post.group_id},
+            )
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "posts_post"')
+        ]
+        self.assertTrue(updates)
+        for sql in updates:
+            self.assertNotIn('"image"', sql)
+            self.assertNotIn('"group_id"', sql)
+        edited = Post.objects.get(pk=post.pk)
+        self.assertEqual(edited.text, "Только текст")
+        self.assertEqual(edited.version, post.version + 1)
 
     def test_form_new_post_cannot_be_created_by_guest(self):
         posts_count = Post.objects.count()
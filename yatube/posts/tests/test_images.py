@@ -0,0 +1,136 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.jobs import run_pending
+from core.models import Job
+from core.tests.utils import run_on_commit
+
+from ..images import ingest_image
+from ..models import Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def make_upload(size, image_format="JPEG", name="photo.jpg", exif=None):
+    output = BytesIO()
+    options = {"exif": exif} if exif else {}
+    Image.new("RGB", size, "white").save(output, image_format, **options)
+    return SimpleUploadedFile(name, output.getvalue())
+
+
+def make_animation(size, frames):
+    output = BytesIO()
+    images = [
+        Image.new("RGB", size, color) for color in ("red", "green", "blue")
+    ][:frames]
+    images[0].save(
+        output,
+        "GIF",
+        save_all=True,
+        append_images=images[1:],
+        duration=50,
+        comment=b"Camera",
+    )
+    return SimpleUploadedFile("anim.gif", output.getvalue())
+
+
+@override_settings(IMAGE_MAX_SIZE=(100, 100))
+class IngestImageTests(TestCase):
+    def test_large_image_is_downscaled_and_stripped(self):
+        exif = Image.Exif()
+        exif[0x010F] = "Camera"
+        stored = ingest_image(make_upload((400, 200), exif=exif.tobytes()))
+        image = Image.open(stored)
+        self.assertEqual(image.size, (100, 50))
+        self.assertEqual(image.format, "JPEG")
+        self.assertEqual(len(image.getexif()), 0)
+        self.assertEqual(stored.name, "photo.jpg")
+
+    def test_animation_is_downscaled_frame_by_frame(self):
+        stored = ingest_image(make_animation((400, 200), 3))
+        image = Image.open(stored)
+        self.assertEqual(image.format, "GIF")
+        self.assertEqual(image.size, (100, 50))
+        self.assertEqual(image.n_frames, 3)
+        self.assertNotIn("comment", image.info)
+
+    @override_settings(IMAGE_MAX_FRAMES=2)
+    def test_long_animation_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            ingest_image(make_animation((10, 10), 3))
+
+    @override_settings(IMAGE_MAX_PIXELS=100)
+    def test_decompression_bomb_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            ingest_image(make_upload((20, 20)))
+
+    def test_unsupported_format_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            ingest_image(make_upload((10, 10), "BMP", "photo.bmp"))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_RELEASE_GRACE=0)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def create_post(self):
+        return Post.objects.create(
+            text="Мем",
+            author=self.user,
+            image=make_upload((10, 10), name="meme.jpg"),
+        )
+
+    def test_same_content_is_stored_once(self):
+        post = self.create_post()
+        post_2 = self.create_post()
+        self.assertEqual(post.image.name, post_2.image.name)
+        with run_on_commit():
+            post.delete()
+        self.assertTrue(default_storage.exists(post_2.image.name))
+        with run_on_commit():
+            post_2.delete()
+        self.assertFalse(default_storage.exists(post_2.image.name))
+
+    def test_replaced_image_is_released(self):
+        post = self.create_post()
+        old_name = post.image.name
+        post.image = make_upload((20, 20), name="other.jpg")
+        with run_on_commit():
+            post.save()
+        self.assertNotEqual(post.image.name, old_name)
+        self.assertFalse(default_storage.exists(old_name))
+
+    @override_settings(JOBS_ALWAYS_EAGER=False, IMAGE_RELEASE_GRACE=60)
+    def test_reuploaded_image_survives_pending_release(self):
+        post = self.create_post()
+        with run_on_commit():
+            post.delete()
+        # Тот же файл загружают снова, пока пост ещё не сохранён.
+        name = default_storage.save(
+            "posts/meme.jpg", make_upload((10, 10), name="meme.jpg")
+        )
+        self.assertEqual(name, post.image.name)
+        with run_on_commit():
+            run_pending()
+        self.assertTrue(default_storage.exists(name))
+        rescheduled = Job.objects.get(name="posts.release_image")
+        self.assertIn(name, rescheduled.payload)
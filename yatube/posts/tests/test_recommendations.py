@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Recommendation
+from ..recommendations import build_recommendations, load_graph, recommend
+
+User = get_user_model()
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.twin, cls.loner = (
+            User.objects.create_user(username=name)
+            for name in ("reader", "twin", "loner")
+        )
+        cls.authors = [
+            User.objects.create_user(username=f"author_{i}")
+            for i in range(4)
+        ]
+        a = cls.authors
+        Follow.objects.bulk_create([
+            Follow(user=cls.reader, author=a[0]),
+            Follow(user=cls.twin, author=a[0]),
+            Follow(user=cls.twin, author=a[1]),
+            Follow(user=a[0], author=a[2]),
+            Follow(user=a[3], author=a[1]),
+            Follow(user=a[1], author=a[0]),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_recommend_uses_second_degree_and_co_follows(self):
+        following, followers = load_graph()
+        ranked = recommend(self.reader.pk, following, followers, 10)
+        authors = {author for _, author in ranked}
+        self.assertEqual(authors, {self.authors[1].pk, self.authors[2].pk})
+        self.assertNotIn(self.authors[0].pk, authors)
+
+    def test_user_without_follows_gets_popular_authors(self):
+        build_recommendations([self.loner.pk], top_k=1)
+        self.assertEqual(
+            Recommendation.objects.get(user=self.loner).author,
+            self.authors[0],
+        )
+
+    def test_recommendations_shown_on_pages(self):
+        out = StringIO()
+        call_command("build_recommendations", stdout=out)
+        self.assertIn("Сохранено рекомендаций", out.getvalue())
+        for url in (
+            reverse("posts:follow_index"),
+            reverse("posts:profile", args=[self.loner.username]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, "/profile/author_1/")
+                self.assertNotContains(response, "/profile/author_0/")
+
+    def test_followed_author_is_hidden(self):
+        build_recommendations([self.reader.pk], top_k=10)
+        Follow.objects.create(user=self.reader, author=self.authors[1])
+        cache.clear()
+        response = self.client.get(reverse("posts:follow_index"))
+        self.assertNotContains(response, "/profile/author_1/")
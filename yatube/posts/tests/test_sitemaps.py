@@ -0,0 +1,65 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from ..models import Group, Post
+from ..sitemaps import generate_sitemaps
+
+User = get_user_model()
+
+TEMP_SITEMAP_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+BASE_URL = "https://yatube.test"
+
+
+@override_settings(SITEMAP_ROOT=TEMP_SITEMAP_ROOT)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="test-slug",
+            description="Тестовое описание",
+        )
+        cls.posts = [
+            Post.objects.create(text=f"Пост_{i}", author=cls.user)
+            for i in range(5)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+
+    def generate(self):
+        return generate_sitemaps(
+            TEMP_SITEMAP_ROOT, BASE_URL, shard_size=2, force=False
+        )
+
+    def test_posts_are_split_into_shards(self):
+        written = generate_sitemaps(
+            TEMP_SITEMAP_ROOT, BASE_URL, shard_size=2, force=True
+        )
+        post_shards = [name for name in written if "-posts-" in name]
+        self.assertEqual(len(post_shards), 3)
+        response = self.client.get("/sitemap-posts-0.xml")
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(content.count("<url>"), 2)
+        self.assertIn(f"{BASE_URL}/posts/{self.posts[0].pk}/", content)
+        index = b"".join(
+            self.client.get("/sitemap.xml").streaming_content
+        ).decode()
+        self.assertIn(f"{BASE_URL}/sitemap-groups-0.xml", index)
+
+    def test_only_changed_shards_are_rewritten(self):
+        self.generate()
+        self.assertEqual(self.generate(), [])
+        Post.objects.filter(pk=self.posts[0].pk).delete()
+        self.assertEqual(
+            self.generate(),
+            ["sitemap-posts-0.xml", "sitemap-profiles-0.xml"],
+        )
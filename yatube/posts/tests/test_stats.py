@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.group, cls.group_2 = (
+            Group.objects.create(
+                title=f"Группа {i}", slug=f"group-{i}", description="-"
+            )
+            for i in range(2)
+        )
+
+    def stats(self, group):
+        return GroupStats.objects.get(group=group)
+
+    def test_stats_follow_post_events(self):
+        first = Post.objects.create(
+            author=self.user, text="Первый", group=self.group
+        )
+        second = Post.objects.create(
+            author=self.user, text="Второй", group=self.group
+        )
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.latest_post_id, second.pk)
+        second.group = self.group_2
+        second.save()
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 1)
+        self.assertEqual(stats.latest_post_id, first.pk)
+        self.assertEqual(self.stats(self.group_2).latest_post_id, second.pk)
+        first.delete()
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.latest_pub_date)
+
+    def test_rebuild_after_bulk_create(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text="Пост", group=self.group_2)
+            for _ in range(3)
+        )
+        call_command("rebuild_group_stats", stdout=StringIO())
+        self.assertEqual(self.stats(self.group_2).post_count, 3)
+
+    def test_directory_sorted_by_activity(self):
+        Post.objects.create(author=self.user, text="Пост", group=self.group_2)
+        response = self.client.get(reverse("posts:group_directory"))
+        groups = [stats.group for stats in response.context["page_obj"]]
+        self.assertEqual(groups, [self.group_2, self.group])
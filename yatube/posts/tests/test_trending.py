@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.tests.utils import run_on_commit
+
+from ..models import Comment, Post, TrendingBucket, TrendingScore
+from ..trending import (
+    compact,
+    current_bucket,
+    epoch_bucket,
+    parse_cursor,
+    rebase,
+    trending_page,
+    weight,
+)
+
+User = get_user_model()
+
+
+@override_settings(JOBS_ALWAYS_EAGER=True, POSTS_QUANTITY=2)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f"Пост {i}")
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def comment(self, post, count=1):
+        with run_on_commit():
+            for _ in range(count):
+                Comment.objects.create(author=self.user, post=post, text="Ок")
+
+    def test_comment_updates_score(self):
+        self.comment(self.posts[0], 2)
+        self.comment(self.posts[1])
+        bucket = TrendingBucket.objects.get(post=self.posts[0])
+        self.assertEqual(bucket.comments, 2)
+        self.assertGreater(
+            TrendingScore.objects.get(post=self.posts[0]).score,
+            TrendingScore.objects.get(post=self.posts[1]).score,
+        )
+
+    def test_comment_delete_updates_score(self):
+        self.comment(self.posts[0])
+        with run_on_commit():
+            Comment.objects.get(post=self.posts[0]).delete()
+        self.assertFalse(TrendingBucket.objects.exists())
+        self.assertFalse(TrendingScore.objects.exists())
+
+    def test_scores_from_previous_epoch_are_rebased(self):
+        epoch = epoch_bucket()
+        old_epoch = epoch - settings.TRENDING_REBASE_BUCKETS
+        yesterday = current_bucket() - 24
+        # Вчерашний комментарий, очки посчитаны от прежней опоры.
+        TrendingScore.objects.create(
+            post=self.posts[1],
+            score=weight(yesterday, old_epoch),
+            epoch=old_epoch,
+        )
+        self.comment(self.posts[0], 2)
+        self.assertEqual(
+            trending_page()[0], [self.posts[0], self.posts[1]]
+        )
+        rebased = TrendingScore.objects.get(post=self.posts[1])
+        self.assertEqual(rebased.epoch, epoch)
+        self.assertAlmostEqual(
+            rebased.score / weight(yesterday, epoch), 1.0
+        )
+
+    def test_rebase_checks_stale_epochs_once(self):
+        epoch = epoch_bucket()
+        with CaptureQueriesContext(connection) as queries, run_on_commit():
+            rebase(epoch)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("JOIN", queries[0]["sql"])
+        with self.assertNumQueries(0):
+            rebase(epoch)
+
+    def test_keyset_pagination(self):
+        for post, count in zip(self.posts, (3, 1, 2)):
+            self.comment(post, count)
+        first, cursor = trending_page()
+        self.assertEqual(first, [self.posts[0], self.posts[2]])
+        second, cursor = trending_page(parse_cursor(cursor))
+        self.assertEqual(second, [self.posts[1]])
+        self.assertIsNone(cursor)
+
+    def test_trending_view(self):
+        for post, count in zip(self.posts, (3, 1, 2)):
+            self.comment(post, count)
+        response = self.client.get(reverse("posts:trending"))
+        self.assertEqual(response.context["posts"], self.posts[::2])
+        response = self.client.get(
+            reverse("posts:trending"),
+            {"after": response.context["next_cursor"]},
+        )
+        self.assertEqual(response.context["posts"], [self.posts[1]])
+        self.assertIsNone(response.context["next_cursor"])
+
+    def test_compact_drops_expired_buckets(self):
+        self.comment(self.posts[0])
+        old = current_bucket(
+            (timezone.now() - timedelta(days=30)).timestamp()
+        )
+        TrendingBucket.objects.create(
+            post=self.posts[1], bucket=old, comments=5
+        )
+        TrendingScore.objects.create(post=self.posts[1], score=100)
+        self.assertEqual(compact(), 1)
+        self.assertFalse(TrendingBucket.objects.filter(bucket=old).exists())
+        self.assertEqual(trending_page()[0], [self.posts[0]])
+        out = StringIO()
+        call_command("compact_trending", stdout=out)
+        self.assertIn("1", out.getvalue())
@@ -1,9 +1,11 @@
+import re
 import shutil
 import tempfile
 
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
@@ -61,6 +63,7 @@ class PostsURLTests(TestCase):
         shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(PostsURLTests.user)
 
@@ -299,6 +302,7 @@ class PaginatorTests(TestCase):
         )
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(PaginatorTests.user)
 
@@ -357,3 +361,39 @@ class PaginatorTests(TestCase):
                 self.assertEqual(
                     len(response.context["page_obj"]), posts_second_page
                 )
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class StreamingFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="test-slug",
+            description="Тестовое описание",
+        )
+        Post.objects.bulk_create(
+            [
+                Post(author=cls.user, text=f"Пост_{i}", group=cls.group)
+                for i in range(13)
+            ]
+        )
+
+    def test_streamed_feed_matches_rendered_feed(self):
+        urls = [
+            reverse("posts:group", kwargs={"slug": self.group.slug}),
+            reverse("posts:profile", kwargs={"username": self.user}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                rendered = self.client.get(url)
+                with self.settings(STREAMING_FEEDS=True):
+                    streamed = self.client.get(url)
+                self.assertTrue(streamed.streaming)
+                streamed_content = b"".join(streamed.streaming_content)
+                self.assertEqual(
+                    re.sub(rb"\s+", b"", streamed_content),
+                    re.sub(rb"\s+", b"", rendered.content),
+                )
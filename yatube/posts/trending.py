@@ -0,0 +1,190 @@
+import time
+from datetime import datetime, timezone
+from itertools import groupby
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import Comment, TrendingBucket, TrendingScore
+
+REBASED_EPOCH_CACHE_KEY = "posts:trending:rebased_epoch"
+
+
+def current_bucket(timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+    return int(timestamp) // settings.TRENDING_BUCKET_SECONDS
+
+
+def epoch_bucket(bucket=None):
+    """Опорный бакет, относительно которого считаются веса.
+
+    Меняется раз в TRENDING_REBASE_BUCKETS бакетов, чтобы веса не росли
+    бесконечно. После смены опоры старые очки приводятся к новой в rebase.
+    """
+    if bucket is None:
+        bucket = current_bucket()
+    period = settings.TRENDING_REBASE_BUCKETS
+    return bucket // period * period
+
+
+def weight(bucket, epoch):
+    """Вес комментария из бакета bucket.
+
+    Вместо того чтобы уменьшать очки старых постов, новые комментарии
+    получают экспоненциально больший вес: порядок постов тот же, что при
+    затухании, а очки меняются только у прокомментированного поста.
+    """
+    half_lives = (
+        (bucket - epoch)
+        * settings.TRENDING_BUCKET_SECONDS
+        / settings.TRENDING_HALF_LIFE
+    )
+    return 2.0 ** half_lives
+
+
+def score_from_buckets(buckets, epoch):
+    return sum(
+        comments * weight(bucket, epoch) for bucket, comments in buckets
+    )
+
+
+def rebase(epoch):
+    """Приводит очки, посчитанные от прежних опор, к опоре epoch.
+
+    Очки от разных опор несравнимы, поэтому это делается до записи
+    новых. Условие по epoch делает повторный запуск безвредным, а отметка
+    в кэше избавляет от проверки на каждый комментарий; она живёт один
+    бакет, чтобы подобрать очки, записанные от старой опоры на её стыке.
+    """
+    if cache.get(REBASED_EPOCH_CACHE_KEY) == epoch:
+        return
+    stale = (
+        TrendingScore.objects.exclude(epoch=epoch)
+        .order_by()
+        .values_list("epoch", flat=True)
+        .distinct()
+    )
+    for old in list(stale):
+        TrendingScore.objects.filter(epoch=old).update(
+            score=F("score") * weight(old, epoch), epoch=epoch
+        )
+    _mark_rebased(epoch)
+
+
+def _mark_rebased(epoch):
+    transaction.on_commit(
+        lambda: cache.set(
+            REBASED_EPOCH_CACHE_KEY, epoch, settings.TRENDING_BUCKET_SECONDS
+        )
+    )
+
+
+def update_post(post_id, bucket):
+    """Пересчитывает бакет и очки поста по текущим данным.
+
+    Значения вычисляются заново, а не увеличиваются, поэтому повторный
+    запуск для того же комментария ничего не меняет.
+    """
+    size = settings.TRENDING_BUCKET_SECONDS
+    comments = Comment.objects.filter(
+        post_id=post_id,
+        created__gte=_from_timestamp(bucket * size),
+        created__lt=_from_timestamp((bucket + 1) * size),
+    ).count()
+    epoch = epoch_bucket()
+    with transaction.atomic():
+        rebase(epoch)
+        if comments:
+            TrendingBucket.objects.update_or_create(
+                post_id=post_id, bucket=bucket, defaults={"comments": comments}
+            )
+        else:
+            TrendingBucket.objects.filter(
+                post_id=post_id, bucket=bucket
+            ).delete()
+        buckets = TrendingBucket.objects.filter(
+            post_id=post_id, bucket__gte=_window_start()
+        ).values_list("bucket", "comments")
+        if not buckets:
+            TrendingScore.objects.filter(post_id=post_id).delete()
+            return
+        TrendingScore.objects.update_or_create(
+            post_id=post_id,
+            defaults={
+                "score": score_from_buckets(buckets, epoch),
+                "epoch": epoch,
+            },
+        )
+
+
+def compact(batch_size=1000):
+    """Удаляет бакеты вне окна и пересчитывает очки от текущей опоры.
+
+    Возвращает число постов в рейтинге после сжатия.
+    """
+    start = _window_start()
+    epoch = epoch_bucket()
+    TrendingBucket.objects.filter(bucket__lt=start).delete()
+    buckets = (
+        TrendingBucket.objects.order_by("post_id")
+        .values_list("post_id", "bucket", "comments")
+        .iterator()
+    )
+    scores = []
+    ranked = 0
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        for post_id, rows in groupby(buckets, key=lambda row: row[0]):
+            score = score_from_buckets(
+                ((bucket, comments) for _, bucket, comments in rows), epoch
+            )
+            scores.append(
+                TrendingScore(post_id=post_id, score=score, epoch=epoch)
+            )
+            if len(scores) >= batch_size:
+                ranked += len(TrendingScore.objects.bulk_create(scores))
+                scores = []
+        ranked += len(TrendingScore.objects.bulk_create(scores))
+        _mark_rebased(epoch)
+    return ranked
+
+
+def trending_page(after=None, limit=None):
+    """Страница рейтинга по ключу (score, post_id) без OFFSET.
+
+    Возвращает посты страницы и курсор следующей страницы или None.
+    """
+    limit = limit or settings.POSTS_QUANTITY
+    scores = TrendingScore.objects.select_related(
+        "post__author", "post__group"
+    )
+    if after is not None:
+        score, post_id = after
+        scores = scores.filter(
+            Q(score__lt=score) | Q(score=score, post_id__lt=post_id)
+        )
+    rows = list(scores.order_by("-score", "-post_id")[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = f"{last.score!r}_{last.post_id}"
+    return [row.post for row in rows[:limit]], next_cursor
+
+
+def parse_cursor(value):
+    try:
+        score, post_id = value.rsplit("_", 1)
+        return float(score), int(post_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _window_start():
+    return current_bucket() - settings.TRENDING_WINDOW_BUCKETS
+
+
+def _from_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
@@ -1,15 +1,40 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from . import views
+from . import api, feeds, views
 
 app_name = "posts"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("trending/", views.trending, name="trending"),
+    path("groups/", views.group_directory, name="group_directory"),
     path("group/<slug:slug>/", views.group_posts, name="group"),
+    path("rss/", feeds.cached_feed(feeds.PostsFeed()), name="feed_rss"),
+    path("atom/", feeds.cached_feed(feeds.AtomPostsFeed()), name="feed_atom"),
+    path(
+        "group/<slug:slug>/rss/",
+        feeds.cached_feed(feeds.GroupPostsFeed()),
+        name="group_feed_rss",
+    ),
+    path(
+        "group/<slug:slug>/atom/",
+        feeds.cached_feed(feeds.AtomGroupPostsFeed()),
+        name="group_feed_atom",
+    ),
     path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
     path("profile/<str:username>/", views.profile, name="profile"),
+    path(
+        "profile/<str:username>/rss/",
+        feeds.cached_feed(feeds.AuthorPostsFeed()),
+        name="profile_feed_rss",
+    ),
+    path(
+        "profile/<str:username>/atom/",
+        feeds.cached_feed(feeds.AtomAuthorPostsFeed()),
+        name="profile_feed_atom",
+    ),
     path("create/", views.post_create, name="post_create"),
+    path("api/posts/batch/", api.post_batch, name="post_batch"),
     path("posts/<int:post_id>/edit/", views.post_edit, name="post_edit"),
     path(
         "posts/<int:post_id>/comment/", views.add_comment, name="add_comment"
@@ -25,4 +50,9 @@ urlpatterns = [
         views.profile_unfollow,
         name="profile_unfollow",
     ),
+    re_path(
+        r"^(?P<filename>sitemap(-[a-z]+-\d+)?\.xml)$",
+        views.sitemap,
+        name="sitemap",
+    ),
 ]
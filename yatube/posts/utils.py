@@ -1,9 +1,32 @@
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.shortcuts import render
 
+from core.paginator import EstimatedCountPaginator
+from core.streaming import stream_render
 
-def paginator_def(request, posts):
-    paginator = Paginator(posts, settings.POSTS_QUANTITY)
+
+def paginator_def(request, posts, count=None):
+    """Страница posts; count — денормализованное число записей, если есть."""
+    paginator = EstimatedCountPaginator(
+        posts, settings.POSTS_QUANTITY, count=count
+    )
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+def render_feed(request, template, context):
+    """Рендерит ленту постов целиком или потоком при STREAMING_FEEDS."""
+    if not settings.STREAMING_FEEDS:
+        return render(request, template, context)
+    posts = context["page_obj"].object_list
+    if hasattr(posts, "iterator"):
+        posts = posts.iterator()
+    return stream_render(
+        request,
+        template,
+        context,
+        "posts/includes/post_card.html",
+        posts,
+        "post",
+    )
@@ -1,69 +1,134 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import F
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 
+from core.pagecache import cache_page_shell
+
+from .archive import ChainedPosts, get_post_or_archived
+from .caches import (
+    get_comments,
+    get_feed_versions,
+    get_group_or_404,
+    get_groups,
+    get_post_author,
+)
+from .edits import EditConflict, save_post_changes, submitted_version
 from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post, User
-from .utils import paginator_def
+from .models import Follow, GroupStats, Post, User
+from .trending import parse_cursor, trending_page
+from .utils import paginator_def, render_feed
 
 
+@cache_page_shell(lambda request: get_feed_versions("all", "groups"))
 def index(request):
-    posts = Post.objects.select_related("group").all()
+    posts = Post.objects.select_related("author", "group").all()
     page_obj = paginator_def(request, posts)
     context = {
         "page_obj": page_obj,
     }
 
     template = "posts/index.html"
-    return render(request, template, context)
+    return render_feed(request, template, context)
 
 
+@cache_page_shell(
+    lambda request, slug: get_feed_versions(
+        "groups", f"group:{get_group_or_404(slug).pk}"
+    )
+)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    page_obj = paginator_def(request, posts)
+    group = get_group_or_404(slug)
+    posts = ChainedPosts(
+        group.posts.select_related("author", "group"),
+        group.archived_posts.select_related("author", "group"),
+    )
+    # Счётчик группы учитывает и архивные посты.
+    post_count = (
+        GroupStats.objects.filter(group=group)
+        .values_list("post_count", flat=True)
+        .first()
+    )
+    page_obj = paginator_def(request, posts, post_count)
     context = {
         "group": group,
         "page_obj": page_obj,
     }
 
     template = "posts/group_list.html"
-    return render(request, template, context)
+    return render_feed(request, template, context)
+
+
+def group_directory(request):
+    stats = GroupStats.objects.select_related("group").order_by(
+        F("latest_pub_date").desc(nulls_last=True), "group_id"
+    )
+    page_obj = paginator_def(request, stats)
+    return render(request, "posts/groups.html", {"page_obj": page_obj})
 
 
+@cache_page_shell(
+    lambda request, username: get_feed_versions(
+        "groups", f"author:{username}"
+    )
+)
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    following = False
-    if request.user.is_authenticated:
-        follow = Follow.objects.filter(user=request.user, author=author)
-        if follow.exists():
-            following = True
-    posts = author.posts.all()
+    posts = ChainedPosts(
+        author.posts.select_related("author", "group"),
+        author.archived_posts.select_related("author", "group"),
+    )
     page_obj = paginator_def(request, posts)
     context = {
         "author": author,
         "page_obj": page_obj,
-        "following": following,
     }
-    return render(request, "posts/profile.html", context)
+    return render_feed(request, "posts/profile.html", context)
 
 
+def trending(request):
+    after = parse_cursor(request.GET.get("after"))
+    posts, next_cursor = trending_page(after)
+    context = {
+        "posts": posts,
+        "next_cursor": next_cursor,
+    }
+    return render(request, "posts/trending.html", context)
+
+
+@cache_page_shell(
+    lambda request, post_id: get_feed_versions(
+        "groups", f"post:{post_id}", f"author:{get_post_author(post_id)}"
+    )
+)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    posts = post.author.posts.all()
+    post, archived = get_post_or_archived(post_id)
+    if post is None:
+        raise Http404("Пост не найден")
+    posts_count = (
+        post.author.posts.count() + post.author.archived_posts.count()
+    )
     form = CommentForm()
-    comments = Comment.objects.filter(post=post)
+    if archived:
+        comments = list(post.comments.select_related("author"))
+    else:
+        comments = get_comments(post.pk)
     context = {
         "post": post,
-        "posts_count": posts.count(),
+        "posts_count": posts_count,
         "comments": comments,
         "form": form,
+        "archived": archived,
     }
     return render(request, "posts/post_detail.html", context)
 
 
 @login_required
 def post_create(request):
-    groups = Group.objects.all()
+    groups = get_groups()
     form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         form.save(commit=False)
@@ -82,21 +147,33 @@ def post_create(request):
 @login_required
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
-    groups = Group.objects.all()
+    groups = get_groups()
     is_edit = True
     if post.author != request.user:
         return redirect("posts:post_detail", post_id=post_id)
     form = PostForm(
         request.POST or None, files=request.FILES or None, instance=post
     )
+    conflict = False
     if form.is_valid():
-        form.save()
-        return redirect("posts:post_detail", post_id=post_id)
+        try:
+            save_post_changes(
+                post, form.changed_data, submitted_version(request)
+            )
+        except EditConflict:
+            # Показываем актуальный пост, чтобы автор увидел чужую правку.
+            conflict = True
+            post = get_object_or_404(Post, pk=post_id)
+            form = PostForm(instance=post)
+        else:
+            return redirect("posts:post_detail", post_id=post_id)
 
     context = {
         "form": form,
         "is_edit": is_edit,
         "groups": groups,
+        "version": post.version,
+        "conflict": conflict,
     }
 
     template = "posts/create_post.html"
@@ -113,7 +190,7 @@ def add_comment(request, post_id):
         comment.post = post
         comment.save()
         return redirect("posts:post_detail", post_id=post_id)
-    comments = Comment.objects.filter(post_id=post_id)
+    comments = get_comments(post_id)
     context = {
         "form": form,
         "comments": comments,
@@ -125,13 +202,15 @@ def add_comment(request, post_id):
 
 @login_required
 def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
+    posts = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related("author", "group")
     page_obj = paginator_def(request, posts)
     context = {
         "page_obj": page_obj,
     }
     template = "posts/follow.html"
-    return render(request, template, context)
+    return render_feed(request, template, context)
 
 
 @login_required
@@ -147,3 +226,10 @@ def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
     Follow.objects.filter(user=request.user, author=author).delete()
     return redirect("posts:follow_index")
+
+
+def sitemap(request, filename):
+    path = os.path.join(settings.SITEMAP_ROOT, filename)
+    if not os.path.isfile(path):
+        raise Http404("Карта сайта ещё не создана")
+    return FileResponse(open(path, "rb"), content_type="application/xml")
@@ -0,0 +1,33 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from core.jobs import enqueue
+
+from .backends import invalidate_user
+
+User = get_user_model()
+
+
+class YatubeUserAdmin(UserAdmin):
+    actions = ["delete_in_background"]
+
+    def delete_in_background(self, request, queryset):
+        """Блокирует пользователей сразу, а удаляет задачей posts.delete_user.
+
+        Обычное удаление загружает все посты и комментарии в память.
+        """
+        user_ids = list(queryset.values_list("pk", flat=True))
+        queryset.update(is_active=False)
+        for user_id in user_ids:
+            invalidate_user(user_id)
+            enqueue("posts.delete_user", user_id=user_id)
+        self.message_user(
+            request, f"Поставлено в очередь на удаление: {len(user_ids)}"
+        )
+
+    delete_in_background.short_description = "Удалить в фоне"
+
+
+admin.site.unregister(User)
+admin.site.register(User, YatubeUserAdmin)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = "users:user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    Кеш сбрасывается сигналами при сохранении и удалении пользователя,
+    в том числе при смене пароля и обновлении last_login. Массовый
+    update() сигналов не шлёт, после него нужен invalidate_user. Кеш
+    используется только при USER_CACHE_ENABLED, то есть с общим
+    бэкендом кеша: иначе другие процессы продолжали бы пускать
+    пользователя со сменённым паролем.
+    """
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_ENABLED:
+            return super().get_user(user_id)
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..backends import CachedModelBackend
+
+User = get_user_model()
+
+
+@override_settings(
+    USER_CACHE_ENABLED=True,
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+)
+class CachedUserTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_authenticated_page_has_no_auth_queries(self):
+        url = reverse("about:author")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, "Пользователь: HasNoName")
+
+    def test_user_save_invalidates_cache(self):
+        backend = CachedModelBackend()
+        user = backend.get_user(self.user.pk)
+        user.first_name = "Новое имя"
+        user.save()
+        self.assertEqual(
+            backend.get_user(self.user.pk).first_name, "Новое имя"
+        )
+
+    def test_deleted_user_is_logged_out(self):
+        User.objects.get(pk=self.user.pk).delete()
+        response = self.client.get(reverse("posts:follow_index"))
+        self.assertEqual(response.status_code, 302)
+
+
+class LocalCacheUserTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="HasNoName")
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(USER_CACHE_ENABLED=False)
+    def test_bulk_update_is_seen_without_shared_cache(self):
+        backend = CachedModelBackend()
+        self.assertIsNotNone(backend.get_user(self.user.pk))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(backend.get_user(self.user.pk))
@@ -51,12 +51,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.RateLimitMiddleware",
 ]
 
 ROOT_URLCONF = "yatube.urls"
@@ -95,6 +97,10 @@ DATABASES = {
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+
+USER_CACHE_TIMEOUT = 60 * 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -138,6 +144,15 @@ STATIC_URL = "/static/"
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
 
+STATIC_ROOT = os.path.join(BASE_DIR, "collected_static")
+
+if not DEBUG:
+    STATICFILES_STORAGE = "core.storage.CompressedManifestStaticFilesStorage"
+
+STATICFILES_COMPRESS_WORKERS = os.cpu_count() or 1
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_MAX_AGE = 60 * 60
+
 LOGIN_URL = "users:login"
 LOGIN_REDIRECT_URL = "posts:index"
 # LOGOUT_REDIRECT_URL = 'posts:index'
@@ -146,14 +161,131 @@ EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 POSTS_QUANTITY = 10
+# Отдавать ленты потоком. Тестовый клиент не видит контекст таких ответов.
+STREAMING_FEEDS = False
+
+# Страницы для анонимных посетителей, см. core.pagecache.
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_TIMEOUT = 60 * 5
+# Числовые параметры запроса, от которых зависят кешируемые страницы.
+PAGE_CACHE_QUERY_PARAMS = ("page",)
+# "server" — фрагменты {% hole %} вставляет приложение,
+# "esi" — прокси по тегам <esi:include>.
+HOLE_PUNCHING_MODE = "server"
+
+GROUPS_CACHE_TIMEOUT = 60 * 60
+FOLLOWING_CACHE_TIMEOUT = 60 * 60
+COMMENTS_CACHE_TIMEOUT = 60 * 60
+
+SITE_URL = "http://localhost:8000"
+SITEMAP_ROOT = os.path.join(BASE_DIR, "sitemaps")
+SITEMAP_SHARD_SIZE = 50000
+
+# Не больше limit запросов клиента за скользящее окно в period секунд,
+# по имени маршрута. RATELIMIT_PROXY_COUNT — число доверенных прокси
+# перед приложением, которые дописывают X-Forwarded-For.
+RATELIMIT_ENABLED = True
+RATELIMIT_PROXY_COUNT = 0
+RATELIMITS = {
+    "posts:post_create": {"limit": 10, "period": 60, "methods": ["POST"]},
+    "posts:add_comment": {"limit": 20, "period": 60, "methods": ["POST"]},
+    "posts:profile_follow": {"limit": 30, "period": 60},
+    "posts:post_batch": {"limit": 10, "period": 60, "methods": ["POST"]},
+}
+POST_BATCH_MAX_SIZE = 500
+
+# Рейтинг по комментариям: часовые бакеты за неделю, вес вдвое
+# меньше за сутки. Опора весов сдвигается раз в 30 дней (compact_trending).
+TRENDING_BUCKET_SECONDS = 60 * 60
+TRENDING_HALF_LIFE = 60 * 60 * 24
+TRENDING_WINDOW_BUCKETS = 24 * 7
+TRENDING_REBASE_BUCKETS = 24 * 30
+
+# Рекомендации авторов пересчитывает build_recommendations.
+RECOMMENDATIONS_TOP_K = 20
+RECOMMENDATIONS_SHOWN = 5
+RECOMMENDATIONS_SECOND_DEGREE_WEIGHT = 0.5
+RECOMMENDATIONS_MAX_FOLLOWERS = 1000
+
+# Посты старше этого срока archive_posts переносит в архивные таблицы.
+ARCHIVE_AFTER_DAYS = 365 * 2
+ARCHIVE_BATCH_SIZE = 500
+
+# Выше этого числа строк пагинаторы берут оценку вместо COUNT(*).
+ESTIMATED_COUNT_THRESHOLD = 10000
+COUNT_CACHE_TIMEOUT = 60 * 10
+
+# Размер пачки фонового удаления пользователей и постов.
+DELETION_BATCH_SIZE = 1000
+
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Без запущенного manage.py run_workers задачи выполняются сразу.
+JOBS_ALWAYS_EAGER = DEBUG
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 10
+JOBS_LEASE_SECONDS = 60
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# "x-accel-redirect" (nginx), "x-sendfile" (Apache, lighttpd) или None,
+# тогда файлы отдаёт сам Django.
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_MAX_AGE = 60 * 60
+
+DEFAULT_FILE_STORAGE = "core.storage.ContentAddressedStorage"
+# Файл, который недавно сохраняли заново, не удаляется столько секунд:
+# пост с ним может быть ещё не зафиксирован.
+IMAGE_RELEASE_GRACE = 60 * 60
+THUMBNAIL_STORAGE = "django.core.files.storage.FileSystemStorage"
+
+RESPONSIVE_IMAGE_GEOMETRY = "960x339"
+RESPONSIVE_IMAGE_WIDTHS = (480, 768, 960)
+# AVIF используется, только если его поддерживают Pillow и sorl-thumbnail.
+RESPONSIVE_IMAGE_FORMATS = ("AVIF", "WEBP")
+RESPONSIVE_IMAGE_QUALITY = 80
+
+IMAGE_ALLOWED_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+IMAGE_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+IMAGE_MAX_PIXELS = 40 * 1000 * 1000
+IMAGE_MAX_SIZE = (1920, 1920)
+IMAGE_MAX_FRAMES = 300
+IMAGE_QUALITY = 85
+
+HTML_MINIFY = True
+COMPRESS_MIN_SIZE = 512
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 5
+COMPRESS_CONTENT_TYPES = (
+    "text/html",
+    "application/json",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/xml",
+)
+
 CSRF_FAILURE_VIEW = "core.views.csrf_failure"
 
+# В продакшене с воркерами кеш должен быть общим (см. core.W001).
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
+# Сессии и пользователь сессии кешируются, только если кеш общий:
+# выход, смену пароля и блокировку должны сразу увидеть все процессы.
+SHARED_CACHE = "locmem" not in CACHES["default"]["BACKEND"].lower()
+USER_CACHE_ENABLED = SHARED_CACHE
+# С общим кешем сессии читаются из кеша, в базу только пишутся.
+SESSION_ENGINE = (
+    "django.contrib.sessions.backends.cached_db"
+    if SHARED_CACHE
+    else "django.contrib.sessions.backends.db"
+)
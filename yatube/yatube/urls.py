@@ -14,9 +14,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.media import serve_media
+from core.static import serve_static
+from core.views import hole_fragment
 
 urlpatterns = [
     path("", include("posts.urls", namespace="posts")),
@@ -24,13 +27,20 @@ urlpatterns = [
     path("auth/", include("users.urls", namespace="users")),
     path("auth/", include("django.contrib.auth.urls")),
     path("about/", include("about.urls", namespace="about")),
+    path("_hole/", hole_fragment, name="hole"),
+    re_path(
+        rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$",
+        serve_media,
+        name="media",
+    ),
+    # При DEBUG статику перехватывает runserver до этого маршрута.
+    re_path(
+        rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.+)$",
+        serve_static,
+        name="static",
+    ),
 ]
 
 handler404 = "core.views.page_not_found"
 handler403 = "core.views.permission_denied_view"
 handler500 = "core.views.server_error"
-
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )